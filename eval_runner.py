@@ -4,12 +4,12 @@
 import argparse
 import json
 import os
+import re
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any, Protocol, TypedDict
 
-import yaml
-
 
 def load_dotenv() -> None:
     """Load .env file"""
@@ -149,11 +149,21 @@ class PromptEvaluator:
                 base_path = "."
 
         self.base_path = Path(base_path)
-        self.detection_tests = self._load_detection_tests()
-        self.generation_tests = self._load_generation_tests()
+
+    @cached_property
+    def detection_tests(self) -> dict[str, list[dict[str, Any]]]:
+        """Detection test cases, loaded on first access"""
+        return self._load_detection_tests()
+
+    @cached_property
+    def generation_tests(self) -> dict[str, list[dict[str, Any]]]:
+        """Generation test cases, loaded on first access"""
+        return self._load_generation_tests()
 
     def _load_detection_tests(self) -> dict[str, list[dict[str, Any]]]:
         """Load detection test cases"""
+        import yaml
+
         tests = {}
         # Check both old and new locations for backward compatibility
         detection_dir = self.base_path / "leap" / "evals" / "detection"
@@ -175,6 +185,8 @@ class PromptEvaluator:
 
     def _load_generation_tests(self) -> dict[str, list[dict[str, Any]]]:
         """Load generation test cases"""
+        import yaml
+
         tests = {}
         # Check both old and new locations for backward compatibility
         generation_dir = self.base_path / "leap" / "evals" / "generation"
@@ -610,6 +622,8 @@ class APIEvaluator:
 
 def load_config(config_path: str) -> dict[str, Any]:
     """Load configuration from YAML or JSON file"""
+    import yaml
+
     path = Path(config_path)
 
     if not path.exists():
@@ -638,21 +652,28 @@ def mock_ai_evaluator(prompt: str) -> str:
     )
 
 
-def parse_prompt_metadata(prompt: str) -> dict[str, str]:
-    """Parse metadata from prompt header"""
-    import re
+_PROMPT_METADATA_RE = re.compile(r"<!-- PROMPT_METADATA\n(.*?)\n-->", re.DOTALL)
+
 
-    metadata = {}
-    match = re.search(r"<!-- PROMPT_METADATA\n(.*?)\n-->", prompt, re.DOTALL)
+@lru_cache(maxsize=512)
+def _parse_metadata_items(prompt: str) -> tuple[tuple[str, str], ...]:
+    """Key/value pairs from a prompt's metadata header, cached per prompt"""
+    match = _PROMPT_METADATA_RE.search(prompt)
+    if not match:
+        return ()
 
-    if match:
-        metadata_text = match.group(1)
-        for line in metadata_text.strip().split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                metadata[key.strip()] = value.strip()
+    items = []
+    for line in match.group(1).strip().split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            items.append((key.strip(), value.strip()))
+    return tuple(items)
 
-    return metadata
+
+def parse_prompt_metadata(prompt: str) -> dict[str, str]:
+    """Parse metadata from prompt header"""
+    # A new dict per call; callers may update it
+    return dict(_parse_metadata_items(prompt))
 
 
 def _write_multi_config_report(multi_report: MultiConfigReport, output_path: str) -> None:
@@ -6,6 +6,7 @@ enforcement specifications, and platform requirements.
 """
 
 from .loaders import LeapLoader
+from .models import Principle
 
 __version__ = "1.0.0"
-__all__ = ["LeapLoader"]
+__all__ = ["LeapLoader", "Principle"]
@@ -0,0 +1,153 @@
+"""
+Background prompt server for repeated CLI invocations.
+
+A daemon holds the parsed YAML in memory and answers requests over a Unix
+socket, so later `leap` calls skip interpreter startup costs and file parsing.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Renders a prompt for a CLI command from its options, e.g. PrinciplesCLI.render
+PromptHandler = Callable[..., str]
+
+# Seconds to wait on a daemon before rendering in-process instead
+_CONNECT_TIMEOUT = 0.5
+_RESPONSE_TIMEOUT = 5.0
+
+
+class _Shutdown(BaseException):
+    """Raised on SIGTERM to unwind serve_forever past the request handler's excepts"""
+
+
+def get_socket_path() -> Path:
+    """Socket path, overridable with LEAP_DAEMON_SOCKET"""
+    override = os.getenv("LEAP_DAEMON_SOCKET")
+    return Path(override) if override else Path.home() / ".leap_cli.sock"
+
+
+def is_supported() -> bool:
+    """Daemon mode needs Unix sockets and fork"""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+
+class _PromptServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Path, handler: PromptHandler) -> None:
+        self.prompt_handler = handler
+        super().__init__(str(socket_path), _PromptRequestHandler)
+
+
+class _PromptRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one JSON request line: {"cmd": ..., "args": {...}}"""
+
+    server: _PromptServer
+
+    def handle(self) -> None:
+        response: dict[str, Any]
+        # LeapLoader reports unreadable YAML on stdout and then exits; keep both for the client
+        loader_output = io.StringIO()
+        try:
+            request = json.loads(self.rfile.readline())
+            with contextlib.redirect_stdout(loader_output):
+                prompt = self.server.prompt_handler(request["cmd"], **request["args"])
+            response = {"prompt": prompt}
+        except SystemExit:
+            response = {"error": loader_output.getvalue().strip() or "Prompt rendering exited"}
+        # Same failures main() reports; anything else closes the connection unanswered,
+        # so the client renders in-process and the error surfaces there
+        except (OSError, KeyError, ValueError, RuntimeError, AttributeError, TypeError) as e:
+            response = {"error": str(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def is_running(socket_path: Path) -> bool:
+    """Whether a daemon is accepting connections on socket_path"""
+    if not is_supported() or not socket_path.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+    except OSError:
+        return False
+    return True
+
+
+def make_server(handler: PromptHandler, socket_path: Path) -> socketserver.UnixStreamServer:
+    """Bind a prompt server to socket_path, replacing a stale socket file"""
+    if socket_path.exists():
+        socket_path.unlink()
+    return _PromptServer(socket_path, handler)
+
+
+def _raise_shutdown(*_: Any) -> None:
+    raise _Shutdown
+
+
+def serve(handler: PromptHandler, socket_path: Path) -> None:
+    """Fork a detached daemon serving prompts on socket_path"""
+    if is_running(socket_path):
+        print(f"LEAP daemon already running on {socket_path}", file=sys.stderr)
+        return
+
+    # Bind before forking so the socket is ready once the parent returns
+    server = make_server(handler, socket_path)
+    pid = os.fork()
+    if pid:
+        server.socket.close()
+        print(f"LEAP daemon started (pid {pid}) on {socket_path}", file=sys.stderr)
+        return
+
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    # Exit through the finally block below so `kill` removes the socket file
+    signal.signal(signal.SIGTERM, _raise_shutdown)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        os._exit(0)
+
+
+def forward(command: str, options: dict[str, Any], socket_path: Path) -> str | None:
+    """Render a prompt through a running daemon
+
+    Returns None when no daemon is reachable or it doesn't answer in time, so
+    callers can render in-process.
+    """
+    if not is_supported() or not socket_path.exists():
+        return None
+
+    request = json.dumps({"cmd": command, "args": options}).encode() + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            # Also bounds the read below; socket timeouts raise TimeoutError, an OSError
+            sock.settimeout(_RESPONSE_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.sendall(request)
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+
+    if not line:
+        return None
+
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    prompt: str = response["prompt"]
+    return prompt
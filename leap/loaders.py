@@ -2,11 +2,33 @@
 YAML loading and data access for LEAP engineering principles.
 """
 
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import yaml
+# Bundled data directory used when no base path is given
+_PACKAGE_DIR = Path(__file__).parent
+
+
+@lru_cache(maxsize=64)
+def _parse_yaml_file(file_path: str, mtime_ns: int) -> dict[str, Any]:
+    """Parse a YAML file once per modification time; the result is shared, so never mutate it"""
+    # Imported on first load so --help and daemon-forwarded runs never pay for PyYAML
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it, several times faster to parse
+    safe_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        # Bytes let the parser detect the encoding itself instead of using the locale default
+        with open(file_path, "rb") as f:
+            data = yaml.load(f, Loader=safe_loader)
+    except yaml.YAMLError as e:
+        # Exceptions are not cached, so a fixed file parses on the next call
+        print(f"Error parsing YAML: {e}")
+        sys.exit(1)
+    return dict(data) if data is not None else {}
 
 
 class LeapLoader:
@@ -15,24 +37,44 @@ class LeapLoader:
     def __init__(self, base_path: Path | None = None):
         """Initialize loader with base path"""
         if base_path is None:
-            base_path = Path(__file__).parent
+            base_path = _PACKAGE_DIR
 
         self.base_path = base_path
         self.core_path = self.base_path / "core"
         self.modules_path = self.base_path / "modules"
+        self.detection_path = self.modules_path / "detection"
+        self.rules_path = self.detection_path / "rules"
+        # path -> st_mtime_ns of every file parsed through load_yaml
+        self._source_mtimes: dict[str, int] = {}
 
     def load_yaml(self, file_path: Path) -> dict[str, Any]:
-        """Load YAML safely"""
+        """Load YAML safely
+
+        Returns a shallow copy of the cached parse, so callers may add or replace
+        top-level keys; nested values are still shared and must not be mutated.
+        """
         try:
-            with open(file_path) as f:
-                data = yaml.safe_load(f)
-                return dict(data) if data is not None else {}
+            mtime_ns = os.stat(file_path).st_mtime_ns
         except FileNotFoundError:
             print(f"Error: File not found: {file_path}")
             sys.exit(1)
-        except yaml.YAMLError as e:
-            print(f"Error parsing YAML: {e}")
-            sys.exit(1)
+
+        self._source_mtimes[str(file_path)] = mtime_ns
+        return dict(_parse_yaml_file(str(file_path), mtime_ns))
+
+    def sources_changed(self) -> bool:
+        """Whether a file read through load_yaml was modified or removed since it was read"""
+        for path, mtime_ns in self._source_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def forget_sources(self) -> None:
+        """Stop tracking files read so far, e.g. before reloading them"""
+        self._source_mtimes.clear()
 
     def load_principles(self) -> dict[str, Any]:
         """Load principles.yaml"""
@@ -56,11 +98,11 @@ class LeapLoader:
 
     def load_severity_levels(self) -> dict[str, Any]:
         """Load severity.yaml"""
-        return self.load_yaml(self.modules_path / "detection" / "severity.yaml")
+        return self.load_yaml(self.detection_path / "severity.yaml")
 
     def load_detection_rules(self, focus_area: str | None = None) -> dict[str, Any]:
         """Load detection rules, optionally filtered by focus area"""
-        rules_path = self.modules_path / "detection" / "rules"
+        rules_path = self.rules_path
 
         if focus_area:
             file_path = rules_path / f"{focus_area}.yaml"
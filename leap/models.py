@@ -0,0 +1,35 @@
+"""
+Typed records for LEAP engineering principles data.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class Principle:
+    """Engineering principle normalized from principles.yaml"""
+
+    name: str
+    why: str = "No description"
+    # None when the principle has no "how" key; a bare value becomes one item
+    how: tuple[str, ...] | None = None
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict[str, Any]) -> "Principle":
+        """Build a principle from its parsed YAML mapping"""
+        how_items = None
+        if "how" in data:
+            how = data["how"]
+            how_items = tuple(str(item) for item in how) if isinstance(how, list) else (str(how),)
+
+        return cls(name=name, why=data.get("why", "No description"), how=how_items)
+
+
+def normalize_principles(principles: dict[str, Any]) -> tuple[Principle, ...]:
+    """Convert parsed principles into Principle records, skipping malformed entries"""
+    return tuple(
+        Principle.from_dict(name, data)
+        for name, data in principles.items()
+        if isinstance(data, dict)
+    )
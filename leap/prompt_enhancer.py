@@ -13,6 +13,15 @@ class LLMClient(Protocol):
     def generate(self, prompt: str) -> str: ...
 
 
+_CACHE_DIR = Path(".cache")
+
+
+def get_cache_file(prompt: str) -> Path:
+    """Path of the cached enhancement for a prompt, relative to the working directory"""
+    prompt_hash = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    return _CACHE_DIR / f"enhanced_{prompt_hash}.txt"
+
+
 def enhance_prompt_with_llm(prompt: str, llm_client: LLMClient, show_diff: bool = False) -> str:
     """Enhance prompt with latest security/accessibility practices using LLM
 
@@ -24,11 +33,8 @@ def enhance_prompt_with_llm(prompt: str, llm_client: LLMClient, show_diff: bool
     Returns:
         Enhanced prompt with additional patterns and practices
     """
-    cache_dir = Path(".cache")
-    cache_dir.mkdir(exist_ok=True)
-
-    prompt_hash = hashlib.md5(prompt.encode()).hexdigest()
-    cache_file = cache_dir / f"enhanced_{prompt_hash}.txt"
+    cache_file = get_cache_file(prompt)
+    cache_file.parent.mkdir(exist_ok=True)
 
     if cache_file.exists():
         print("✓ Using cached enhanced prompt", file=sys.stderr)
@@ -2,361 +2,333 @@
 """Generate prompts for engineering standards"""
 
 import argparse
+import io
+import re
 import sys
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator
+from functools import cached_property, lru_cache
+from itertools import chain, islice
+from typing import Any, NamedTuple
 
-from leap import LeapLoader
+from leap import LeapLoader, daemon
 from leap.filters import filter_principles_by_focus, map_focus_areas_to_enforcement_stages
+from leap.models import Principle, normalize_principles
 
 
-class PrinciplesCLI:
+class _Writer:
+    """Line buffer for prompt sections; getvalue() joins the lines with newlines"""
+
+    __slots__ = ("_buf", "_sep")
+
     def __init__(self) -> None:
-        self.loader = LeapLoader()
+        self._buf = io.StringIO()
+        self._sep = ""
 
-    def format_principles(
-        self, principles: dict[str, Any], focus_areas: list[str] | None = None
-    ) -> str:
-        """Format principles for prompt"""
-        output = []
-        priority_text = "Security > Accessibility > Testing > Performance > Code Style"
-        output.append(f"**Priority Order:** {priority_text}\n")
+    def line(self, text: str = "") -> None:
+        self._buf.write(self._sep)
+        self._buf.write(text)
+        self._sep = "\n"
 
-        if not isinstance(principles, dict):
-            output.append("**Principles:** Unable to parse principles structure")
-            return "\n".join(output)
+    def lines(self, texts: Iterable[str]) -> None:
+        """Write several lines with a single buffer write"""
+        # Check the items, not the joined text: [""] is one blank line
+        if items := list(texts):
+            self.line("\n".join(items))
 
-        if focus_areas:
-            if all(area in principles for area in focus_areas):
-                filtered_principles = {k: v for k, v in principles.items() if k in focus_areas}
-            else:
-                filtered_principles = filter_principles_by_focus(principles, focus_areas)
-        else:
-            filtered_principles = principles
+    def getvalue(self) -> str:
+        return self._buf.getvalue()
 
-        for name, principle in filtered_principles.items():
-            if not isinstance(principle, dict):
-                continue
 
-            output.append(f"### {name.title()}")
-            output.append(f"**Why:** {principle.get('why', 'No description')}")
+class _Pattern(NamedTuple):
+    """Detection pattern flattened from list- or mapping-shaped YAML
 
-            if "how" in principle:
-                output.append("**How:**")
-                how_items = principle["how"]
-                if isinstance(how_items, list):
-                    for item in how_items:
-                        output.append(f"- {item}")
-                else:
-                    output.append(f"- {how_items}")
+    name is None for list entries. has_regex and has_message record which keys the
+    entry set, since a present key may still hold None or an empty string.
+    """
 
-            output.append("")
+    name: str | None
+    regex: Any
+    message: Any
+    has_regex: bool
+    has_message: bool
 
-        return "\n".join(output)
 
-    def format_platform_requirements(self, platform_config: dict[str, Any]) -> str:
-        """Format platform-specific requirements"""
-        output = []
-
-        if "requirements" in platform_config:
-            output.append("**Requirements:**")
-            for req in platform_config["requirements"]:
-                output.append(f"- {req}")
-            output.append("")
-
-        if "approved_dependencies" in platform_config:
-            output.append("**Approved Dependencies:**")
-            for category, deps in platform_config["approved_dependencies"].items():
-                if isinstance(deps, list):
-                    for dep_info in deps:
-                        if isinstance(dep_info, dict) and "name" in dep_info:
-                            purpose = dep_info.get("purpose", "")
-                            version = dep_info.get("version", "")
-                            desc = f" - {purpose}" if purpose else ""
-                            ver = f" v{version}" if version else ""
-                            output.append(f"- {dep_info['name']}{ver}{desc} ({category})")
-                        else:
-                            output.append(f"- {dep_info} ({category})")
-            output.append("")
-
-        if "tools" in platform_config:
-            output.append("**Required Tools:**")
-            for category, tools in platform_config["tools"].items():
-                if isinstance(tools, list):
-                    for tool in tools:
-                        output.append(f"- {tool} ({category})")
-                else:
-                    output.append(f"- {tools} ({category})")
+class _RuleTable(NamedTuple):
+    """Rules flattened into parallel columns so formatters skip shape checks"""
 
-        return "\n".join(output)
+    names: list[str]
+    severities: list[str]
+    descriptions: list[str]
+    patterns: list[list[_Pattern]]
 
-    def format_detection_rules(self, rules: dict[str, Any]) -> str:
-        """Format detection rules for prompt inclusion"""
-        output = []
 
-        for category, category_rules in rules.items():
-            output.append(f"### {category.title()} Rules")
+def _pattern_entries(patterns: Any) -> Iterator[tuple[str | None, dict[str, Any]]]:
+    """Yield (name, entry) for pattern dicts given as a list or a name -> entry mapping
 
-            if isinstance(category_rules, dict) and "rules" in category_rules:
-                actual_rules = category_rules["rules"]
-            else:
-                actual_rules = category_rules
-
-            if isinstance(actual_rules, dict):
-                for rule_name, rule_data in actual_rules.items():
-                    if isinstance(rule_data, dict):
-                        severity = rule_data.get("severity", "unknown")
-                        description = rule_data.get("description", "No description")
-
-                        output.append(
-                            f"**{rule_name.replace('_', ' ').title()}** (Severity: {severity})"
-                        )
-                        output.append(f"- {description}")
-
-                        patterns_to_show = []
-
-                        if "patterns" in rule_data:
-                            patterns = rule_data["patterns"]
-                            if isinstance(patterns, list):
-                                patterns_to_show.extend(patterns)
-                            elif isinstance(patterns, dict):
-                                for _pattern_name, pattern_data in patterns.items():
-                                    if isinstance(pattern_data, dict) and "regex" in pattern_data:
-                                        patterns_to_show.append(pattern_data)
-
-                        for platform_key in [
-                            "android_patterns",
-                            "ios_patterns",
-                            "web_patterns",
-                            "patterns",
-                        ]:
-                            if platform_key in rule_data and isinstance(
-                                rule_data[platform_key], dict
-                            ):
-                                for _pattern_name, pattern_data in rule_data[platform_key].items():
-                                    if isinstance(pattern_data, dict) and "regex" in pattern_data:
-                                        patterns_to_show.append(pattern_data)
-
-                        if patterns_to_show:
-                            output.append("- Detection patterns:")
-                            for pattern in patterns_to_show[:3]:
-                                if isinstance(pattern, dict) and "regex" in pattern:
-                                    output.append(f"  - `{pattern['regex']}`")
-                                    if "message" in pattern:
-                                        output.append(f"    - {pattern['message']}")
-                                else:
-                                    output.append(f"  - `{pattern}`")
-
-                        output.append("")
-
-            output.append("")
-
-        return "\n".join(output)
+    List entries have no name and yield None.
+    """
+    if type(patterns) is list:
+        items: Any = ((None, entry) for entry in patterns)
+    elif type(patterns) is dict:
+        items = patterns.items()
+    else:
+        return
 
-    def format_severity_levels(self, severity: dict[str, Any]) -> str:
-        """Format severity levels for prompt inclusion"""
-        output = []
+    for name, entry in items:
+        if type(entry) is dict:
+            yield name, entry
 
-        severity_order = ["critical", "blocking", "required", "recommended"]
 
-        for level in severity_order:
-            if level in severity:
-                level_data = severity[level]
-                if isinstance(level_data, dict):
-                    description = level_data.get("description", f"{level.title()} violations")
-                    action = level_data.get("action", "See documentation")
-                    llm_instructions = level_data.get("llm_instructions", "")
-                    examples = level_data.get("examples", [])
+def _listed_patterns(rule_data: dict[str, Any], platforms: Iterable[str]) -> Iterator[Any]:
+    """Patterns format_detection_rules lists for a rule
 
-                    output.append(f"- **{level.title()}**: {description}")
-                    output.append(f"  - Action: {action}")
+    A "patterns" list is taken whole, including plain-string entries. Mapping-shaped
+    blocks, "patterns" and each platform's "<platform>_patterns", contribute only
+    entries with a regex; list-shaped platform blocks are not read.
+    """
+    patterns = rule_data.get("patterns")
+    blocks: list[Any] = [patterns] if type(patterns) is dict else []
+    if type(patterns) is list:
+        yield from patterns
 
-                    if llm_instructions:
-                        output.append(f"  - AI Guidance: {llm_instructions}")
+    blocks.extend(rule_data.get(f"{name}_patterns") for name in platforms)
+    for block in blocks:
+        if type(block) is dict:
+            yield from (
+                entry for entry in block.values() if type(entry) is dict and "regex" in entry
+            )
 
-                    if examples:
-                        output.append("  - Examples:")
-                        for example in examples[:3]:
-                            output.append(f"    - {example}")
-                else:
-                    output.append(f"- **{level.title()}**: {level_data}")
 
-        return "\n".join(output)
+def _normalize_rules(rules: Any) -> _RuleTable:
+    """Coerce a rule mapping (or list) into a _RuleTable for focused detection
+
+    Only _format_focused_detection uses this pre-pass; format_detection_rules
+    checks each rule's shape as it goes. Non-dict rules are dropped.
+    """
+    if type(rules) is dict:
+        items: Any = rules.items()
+    elif type(rules) is list:
+        items = ((f"rule_{i}", rule) for i, rule in enumerate(rules))
+    else:
+        items = ()
+
+    table = _RuleTable([], [], [], [])
+    for rule_name, rule_data in items:
+        if type(rule_data) is not dict:
+            continue
+
+        table.names.append(rule_name)
+        table.severities.append(rule_data.get("severity", "unknown"))
+        table.descriptions.append(rule_data.get("description", ""))
+        table.patterns.append(
+            [
+                _Pattern(
+                    name,
+                    entry.get("regex"),
+                    entry.get("message", ""),
+                    "regex" in entry,
+                    "message" in entry,
+                )
+                for name, entry in _pattern_entries(rule_data.get("patterns"))
+            ]
+        )
 
-    def generate_review_prompt(self, platform: str, focus_areas: list[str]) -> str:
-        """Generate code review prompt"""
+    return table
 
-        platform_title = self.loader.get_platform_title(platform)
 
-        severity_file = self.loader.modules_path / "detection" / "severity.yaml"
-        severity_data = self.loader.load_yaml(severity_file)
-        severity_levels = severity_data.get("severity_levels", severity_data)
+_PLATFORMS = ("android", "ios", "web")
 
-        detection_sections = []
-        for area in focus_areas:
-            rules = self._load_detection_rules(area, platform)
-            if rules:
-                detection_sections.append(self._format_focused_detection(area, rules))
+# Most to least severe; unknown severities sort after these
+_SEVERITY_LEVELS = ("critical", "blocking", "required", "recommended")
+_SEVERITY_RANK = {level: rank for rank, level in enumerate(_SEVERITY_LEVELS)}
 
-        enforcement_section = self._format_enforcement_context(focus_areas)
 
-        severity_section = self.format_severity_levels(severity_levels)
+@lru_cache(maxsize=512)
+def _title(name: str) -> str:
+    """Cached str.title() for the small set of keys repeated across prompts"""
+    return name.title()
 
-        prompt = f"""<!-- PROMPT_METADATA
-platform: {platform}
-focus: {",".join(focus_areas)}
-mode: review
--->
 
-# Code Review Assistant for {platform_title}
+_UNDERSCORE_TO_SPACE = str.maketrans("_", " ")
 
-Review code against standards. **Priority**: Security > Accessibility > Testing.
 
-{chr(10).join(detection_sections)}
+@lru_cache(maxsize=512)
+def _pretty(name: str) -> str:
+    """Display form of a snake_case key, e.g. hardcoded_secrets -> Hardcoded Secrets"""
+    return name.translate(_UNDERSCORE_TO_SPACE).title()
 
-## Severity Levels
 
-{severity_section}
+_PRIORITY_LINE = (
+    "**Priority Order:** Security > Accessibility > Testing > Performance > Code Style\n"
+)
 
-## What Happens Next: Automated CI Checks
 
-After your review, the following automated checks will run:
+def _focus_principles(principles: dict[str, Any], focus_areas: list[str] | None) -> dict[str, Any]:
+    """Principles named by focus_areas, or mapped from broader focus areas"""
+    if not focus_areas:
+        return principles
 
-{enforcement_section}
+    focus_set = set(focus_areas)
+    if focus_set <= principles.keys():
+        return {k: v for k, v in principles.items() if k in focus_set}
+    return filter_principles_by_focus(principles, focus_areas)
 
-## Instructions
 
-1. **Start by identifying violations** using the patterns above, then find others
-2. **Classify severity**: Critical → Blocking → Required → Recommended
-3. **Provide specific fixes** with before/after examples
-4. **Focus on**: {", ".join(focus_areas)}
-"""
-        return prompt
+# Separates key points on an architecture principle's summary line
+_BULLET_SEP = " \u2022 "
 
-    def _format_philosophy(self, philosophy: dict[str, Any]) -> str:
-        """Format philosophy for prompt inclusion"""
-        output = []
 
-        if "mantras" in philosophy:
-            output.append("**Mantras**:")
-            for mantra in philosophy["mantras"]:
-                principle = mantra.get("principle", "")
-                explanation = mantra.get("explanation", "")
-                if principle:
-                    output.append(f"- *{principle}* - {explanation}")
-            output.append("")
+@lru_cache(maxsize=128)
+def _display_name(principle_name: str) -> str:
+    """Principle heading for architecture prompts, e.g. Unidirectional Data_Flow"""
+    return _pretty(principle_name).replace("Data Flow", "Data_Flow")
 
-        if "core_values" in philosophy:
-            values_list = []
-            for category, values in philosophy["core_values"].items():
-                if isinstance(values, list) and values:
-                    values_list.append(f"{category.title()}: {values[0]}")
-            if values_list:
-                output.append(f"**Values**: {', '.join(values_list)}")
-                output.append("")
 
-        return "\n".join(output)
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]")
 
-    def _format_enforcement_context(self, focus_areas: list[str]) -> str:
-        """Format enforcement context showing what CI will check"""
-        output = []
 
-        enforcement = self.loader.load_enforcement()
-        ci_pipeline = enforcement.get("enforcement_tools", {}).get("ci_pipeline", {})
-        stages = ci_pipeline.get("stages", [])
+class _DependencyIndex(NamedTuple):
+    """A platform's approved dependencies indexed for name lookups"""
 
-        relevant_stages = map_focus_areas_to_enforcement_stages(focus_areas)
+    names: list[str]
+    by_name: dict[str, dict[str, Any]]  # lowercased name -> details
+    by_key: dict[str, dict[str, Any]]  # lowercased alphanumerics only, e.g. okhttp3
+    joined_names: str  # lowercased names joined by newlines, for substring prefiltering
 
-        for stage in stages:
-            stage_name = stage.get("name", "")
-            if stage_name in relevant_stages:
-                checks = stage.get("checks", [])
-                if checks:
-                    output.append(f"**{stage_name.title()} Stage**:")
-                    for check in checks[:3]:
-                        output.append(f"- {check}")
-                    output.append("")
+    @classmethod
+    def build(cls, approved_deps_config: dict[str, Any]) -> "_DependencyIndex":
+        names = []
+        by_name: dict[str, dict[str, Any]] = {}
+        by_key: dict[str, dict[str, Any]] = {}
+        for deps in approved_deps_config.values():
+            if type(deps) is not list:
+                continue
+            for dep_info in deps:
+                if type(dep_info) is dict and "name" in dep_info:
+                    name = dep_info["name"]
+                    names.append(name)
+                    by_name[name.lower()] = dep_info
+                    by_key.setdefault(_NON_ALPHANUMERIC.sub("", name.lower()), dep_info)
+        return cls(names, by_name, by_key, "\n".join(by_name))
+
+    def match(self, dep: str) -> dict[str, Any] | None:
+        """Details for an approved dependency matching dep, or None if it isn't approved
+
+        Tries the exact name, then the name ignoring punctuation (ok-http -> okhttp),
+        then the first approved name containing dep.
+        """
+        dep_lower = dep.lower()
+        details = self.by_name.get(dep_lower)
+        if details is None:
+            details = self.by_key.get(_NON_ALPHANUMERIC.sub("", dep_lower))
+        if details is None and dep_lower in self.joined_names:
+            details = next((info for name, info in self.by_name.items() if dep_lower in name), None)
+        return details
+
+
+def _approved_dependency_line(dep_info: Any, category: str) -> str:
+    """Requirements line for an approved dependency, e.g. - Retrofit v2.9 - HTTP (networking)"""
+    name = dep_info.get("name") if type(dep_info) is dict else None
+    if name is None:
+        return f"- {dep_info} ({category})"
+
+    version = dep_info.get("version")
+    purpose = dep_info.get("purpose")
+    ver = f" v{version}" if version else ""
+    desc = f" - {purpose}" if purpose else ""
+    return f"- {name}{ver}{desc} ({category})"
+
+
+def _format_dependency_status(dep: str, details: dict[str, Any] | None) -> str:
+    """Status lines for a requested dependency, with its approved details if any"""
+    if details is None:
+        return f"- {dep} - ❌ NOT APPROVED"
+    return (
+        f"- {dep} - ✅ APPROVED\n"
+        f"  - Purpose: {details.get('purpose', 'Not specified')}\n"
+        f"  - Version: {details.get('version', 'Not specified')}"
+    )
 
-        return "\n".join(output)
 
-    def _format_generation_guidance(
-        self, guidance: dict[str, Any], component_type: str, platform: str
-    ) -> str:
-        """Format generation guidance from YAML"""
-        output = []
+def _focused_rule_lines(table: _RuleTable, i: int) -> Iterator[str]:
+    """Yield a rule's summary line and its pattern lines for focused detection"""
+    severity = table.severities[i]
+    yield f"- **{_pretty(table.names[i])}** ({_title(severity)}): {table.descriptions[i]}"
+
+    for pattern in table.patterns[i]:
+        if pattern.has_regex:
+            yield f"  - `{pattern.regex}` → {pattern.message}"
+        elif pattern.has_message and pattern.name is not None:
+            # Named patterns may carry only a message; listed ones need a regex
+            yield f"  - {_pretty(pattern.name)}: {pattern.message}"
+
+
+# Component type -> generation guidance areas
+_COMPONENT_FOCUS_AREAS = {
+    "ui": ["accessibility", "architecture"],
+    "business-logic": ["testing", "architecture"],
+    "data-layer": ["security", "architecture"],
+}
+
+# Component type -> principles included in code generation prompts
+_COMPONENT_PRINCIPLES = {
+    "ui": ["accessibility", "code_consistency"],
+    "business-logic": ["testing", "unidirectional_data_flow"],
+    "data-layer": ["security", "minimal_dependencies"],
+}
+
+# Rendered prompts kept per PrinciplesCLI, e.g. by a long-running daemon
+_PROMPT_CACHE_SIZE = 128
+
+# CLI command -> PrinciplesCLI method that renders its prompt
+_PROMPT_RENDERERS = {
+    "review": "generate_review_prompt",
+    "generate": "generate_code_prompt",
+    "architecture": "generate_architecture_prompt",
+    "dependencies": "generate_dependency_prompt",
+}
+
+
+# Prompt templates filled by the generate_*_prompt methods with str.format;
+# section placeholders receive pre-rendered markdown
+_REVIEW_PROMPT = """<!-- PROMPT_METADATA
+platform: {platform}
+focus: {focus}
+mode: review
+-->
 
-        component_map = {
-            "ui": ["accessibility", "architecture"],
-            "business-logic": ["testing", "architecture"],
-            "data-layer": ["security", "architecture"],
-        }
+# Code Review Assistant for {platform_title}
 
-        focus_areas = component_map.get(component_type, ["architecture"])
+Review code against standards. **Priority**: Security > Accessibility > Testing.
 
-        principle_guidance = guidance.get("principle_guidance", {})
-        for area in focus_areas:
-            if area in principle_guidance:
-                area_data = principle_guidance[area]
-                output.append(f"### {area.title()}")
-
-                if "approach" in area_data:
-                    output.append(f"**Approach**: {area_data['approach']}")
-                    output.append("")
-
-                if platform in area_data:
-                    platform_data = area_data[platform]
-                    if "always" in platform_data:
-                        output.append("**Always**:")
-                        for item in platform_data["always"]:
-                            output.append(f"- {item}")
-                        output.append("")
-
-                    if "never" in platform_data:
-                        output.append("**Never**:")
-                        for item in platform_data["never"]:
-                            output.append(f"- {item}")
-                        output.append("")
+{detection_section}
 
-        common_mistakes = guidance.get("common_mistakes", {})
-        if focus_areas and common_mistakes:
-            output.append("### Common Mistakes to Avoid")
-            for area in focus_areas:
-                if area in common_mistakes:
-                    for mistake in common_mistakes[area][:3]:  # Top 3
-                        output.append(f"- {mistake}")
-            output.append("")
+## Severity Levels
 
-        return "\n".join(output)
+{severity_section}
 
-    def generate_code_prompt(self, platform: str, component_type: str) -> str:
-        """Generate code writing prompt"""
-        principles, platform_title, platform_config = self.loader.get_common_prompt_data(platform)
-        philosophy_data = self.loader.load_philosophy()
+## What Happens Next: Automated CI Checks
 
-        guidance_file = self.loader.modules_path / "generation" / "guidance.yaml"
-        guidance = {}
-        if guidance_file.exists():
-            guidance = self.loader.load_yaml(guidance_file)
+After your review, the following automated checks will run:
 
-        component_to_principles = {
-            "ui": ["accessibility", "code_consistency"],
-            "business-logic": ["testing", "unidirectional_data_flow"],
-            "data-layer": ["security", "minimal_dependencies"],
-        }
+{enforcement_section}
 
-        focus_principles = component_to_principles.get(component_type, ["code_consistency"])
+## Instructions
 
-        philosophy_section = self._format_philosophy(philosophy_data)
-        principles_section = self.format_principles(principles, focus_principles)
-        platform_section = self.format_platform_requirements(platform_config)
-        guidance_section = self._format_generation_guidance(guidance, component_type, platform)
+1. **Start by identifying violations** using the patterns above, then find others
+2. **Classify severity**: Critical → Blocking → Required → Recommended
+3. **Provide specific fixes** with before/after examples
+4. **Focus on**: {focus_list}
+"""
 
-        prompt = f"""<!-- PROMPT_METADATA
+
+_CODE_PROMPT = """<!-- PROMPT_METADATA
 platform: {platform}
 component: {component_type}
 mode: generate
 -->
 
-# Code Generation for {platform_title} {component_type.title()}
+# Code Generation for {platform_title} {component_title}
 
 Generate production-ready code following Livefront engineering standards.
 
@@ -372,7 +344,7 @@ Generate production-ready code following Livefront engineering standards.
 
 {platform_section}
 
-## {component_type.title()} Guidance
+## {component_title} Guidance
 
 {guidance_section}
 
@@ -384,49 +356,11 @@ Generate production-ready code following Livefront engineering standards.
 4. Write testable, maintainable code with clear separation of concerns
 5. Match existing code style and architecture patterns
 """
-        return prompt
-
-    def generate_dependency_prompt(self, platform: str, dependencies: list[str]) -> str:
-        """Generate dependency evaluation prompt"""
-        principles, platform_title, platform_config = self.loader.get_common_prompt_data(platform)
-        approved_deps_config = platform_config.get("approved_dependencies", {})
-
-        approved_deps = []
-        dependency_details = {}
-        for _category, deps in approved_deps_config.items():
-            if isinstance(deps, list):
-                for dep_info in deps:
-                    if isinstance(dep_info, dict) and "name" in dep_info:
-                        dep_name = dep_info["name"]
-                        approved_deps.append(dep_name)
-                        dependency_details[dep_name.lower()] = dep_info
-
-        dependency_status = []
-        for dep in dependencies:
-            dep_lower = dep.lower()
-            is_approved = any(dep_lower in approved_name.lower() for approved_name in approved_deps)
-            status = "✅ APPROVED" if is_approved else "❌ NOT APPROVED"
-            dependency_status.append(f"- {dep} - {status}")
-
-            if is_approved:
-                for approved_name, details in dependency_details.items():
-                    if dep_lower in approved_name.lower():
-                        dependency_status.append(
-                            f"  - Purpose: {details.get('purpose', 'Not specified')}"
-                        )
-                        dependency_status.append(
-                            f"  - Version: {details.get('version', 'Not specified')}"
-                        )
-                        break
 
-        minimal_deps_principle = principles.get("minimal_dependencies", {})
-        minimal_deps_why = minimal_deps_principle.get(
-            "why", "We're responsible for maintaining every single line of code we ship"
-        )
 
-        prompt = f"""<!-- PROMPT_METADATA
+_DEPENDENCY_PROMPT = """<!-- PROMPT_METADATA
 platform: {platform}
-dependencies: {",".join(dependencies)}
+dependencies: {dependency_names}
 mode: dependencies
 -->
 
@@ -435,10 +369,10 @@ mode: dependencies
 Evaluate dependencies against Livefront's standards. **Principle**: {minimal_deps_why}
 
 ## Dependency Status Check
-{chr(10).join(dependency_status)}
+{status_section}
 
 ## Approved Dependencies for {platform_title}
-{chr(10).join(f"- {dep}" for dep in approved_deps)}
+{approved_section}
 
 ## Evaluation Criteria
 - **Security**: No vulnerabilities, regular updates, trustworthy maintainers
@@ -453,25 +387,15 @@ For each dependency, provide:
 2. **Alignment Analysis**: Architectural fit, duplication with existing code
 3. **Recommendation**: ✅ APPROVE, 🤔 REVIEW, or ❌ REJECT with rationale
 """
-        return prompt
-
-    def generate_architecture_prompt(self, platform: str, layer: str) -> str:
-        """Generate architecture guidance prompt"""
-        principles, platform_title, platform_config = self.loader.get_common_prompt_data(platform)
-
-        arch_principles = self._format_focused_architecture(
-            principles, ["unidirectional_data_flow", "minimal_dependencies", "testing"]
-        )
 
-        platform_reqs = self._format_concise_platform(platform_config, platform_title)
 
-        prompt = f"""<!-- PROMPT_METADATA
+_ARCHITECTURE_PROMPT = """<!-- PROMPT_METADATA
 platform: {platform}
 layer: {layer}
 mode: architecture
 -->
 
-# Architecture Assistant for {platform_title} {layer.title()} Layer
+# Architecture Assistant for {platform_title} {layer_title} Layer
 
 Design systems following Livefront's architecture standards. **Priority**: Security > Testing.
 
@@ -479,7 +403,7 @@ Design systems following Livefront's architecture standards. **Priority**: Secur
 
 {platform_reqs}
 
-## {layer.title()} Layer Guidelines
+## {layer_title} Layer Guidelines
 - **Data Flow**: Unidirectional (data down, events up)
 - **State**: Views display state, never modify it
 - **Testing**: 80% coverage on business logic, testable architecture
@@ -498,115 +422,478 @@ Ask clarifying questions if you need more context to make a thorough evaluation.
 Provide specific structure and implementation recommendations.
 """
 
+
+class PromptContext:
+    """YAML data shared by every prompt rendered from one CLI instance
+
+    Each dataset is loaded on first use and reused afterwards, so rendering
+    several prompts in one session parses each file only once. PrinciplesCLI.render
+    replaces the context when a file it read changes.
+    """
+
+    def __init__(self, loader: LeapLoader) -> None:
+        self.loader = loader
+        self._detection_files: dict[str, dict[str, Any]] = {}
+        self._dependency_indexes: dict[str, _DependencyIndex] = {}
+
+    @cached_property
+    def principles(self) -> dict[str, Any]:
+        # Interned keys let focus-area and principle-name lookups match by identity
+        return {sys.intern(name): data for name, data in self.loader.load_principles().items()}
+
+    @cached_property
+    def principle_records(self) -> dict[str, Principle]:
+        """Principles normalized once into Principle records, keyed by name"""
+        return {record.name: record for record in normalize_principles(self.principles)}
+
+    @cached_property
+    def platforms(self) -> dict[str, Any]:
+        return self.loader.load_platforms()
+
+    @cached_property
+    def philosophy(self) -> dict[str, Any]:
+        return self.loader.load_philosophy()
+
+    @cached_property
+    def enforcement(self) -> dict[str, Any]:
+        return self.loader.load_enforcement()
+
+    @cached_property
+    def severity_levels(self) -> dict[str, Any]:
+        severity_data = self.loader.load_severity_levels()
+        severity_levels: dict[str, Any] = severity_data.get("severity_levels", severity_data)
+        return severity_levels
+
+    @cached_property
+    def guidance(self) -> dict[str, Any]:
+        return self.loader.load_generation_guidance()
+
+    def dependency_index(self, platform: str) -> _DependencyIndex:
+        """Approved dependencies for a platform, indexed once per context"""
+        if platform not in self._dependency_indexes:
+            platform_config = self.platforms.get(platform, {})
+            self._dependency_indexes[platform] = _DependencyIndex.build(
+                platform_config.get("approved_dependencies", {})
+            )
+        return self._dependency_indexes[platform]
+
+    def detection_file(self, area: str) -> dict[str, Any]:
+        """Parsed detection rules file for a focus area, empty if it doesn't exist"""
+        if area not in self._detection_files:
+            detection_file = self.loader.rules_path / f"{area}.yaml"
+            self._detection_files[area] = (
+                self.loader.load_yaml(detection_file) if detection_file.exists() else {}
+            )
+        return self._detection_files[area]
+
+
+class PrinciplesCLI:
+    __slots__ = ("loader", "ctx", "_prompts")
+
+    def __init__(self) -> None:
+        self.loader = LeapLoader()
+        self.ctx = PromptContext(self.loader)
+        self._prompts: dict[tuple[Any, ...], str] = {}
+
+    def render(self, kind: str, **kwargs: Any) -> str:
+        """Render the prompt for a CLI command, reusing earlier renders of the same options"""
+        if kind not in _PROMPT_RENDERERS:
+            raise ValueError(f"Unknown prompt kind: {kind}")
+
+        # A long-lived daemon picks up edited YAML by starting over with fresh data
+        if self.loader.sources_changed():
+            self.loader.forget_sources()
+            self.ctx = PromptContext(self.loader)
+            self._prompts.clear()
+
+        key = (
+            kind,
+            *sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in kwargs.items()
+            ),
+        )
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            prompt = getattr(self, _PROMPT_RENDERERS[kind])(**kwargs)
+            if len(self._prompts) >= _PROMPT_CACHE_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del self._prompts[next(iter(self._prompts))]
+            self._prompts[key] = prompt
         return prompt
 
-    def _format_focused_detection(self, area: str, rules: dict[str, Any]) -> str:
-        """Format focused detection patterns for a specific area"""
-        output = [f"## {area.title()} Detection"]
-
-        severity_order = {"critical": 0, "blocking": 1, "required": 2, "recommended": 3}
-
-        try:
-            if isinstance(rules, dict):
-                sorted_rules = sorted(
-                    rules.items(),
-                    key=lambda x: (
-                        severity_order.get(x[1].get("severity", "unknown"), 999)
-                        if isinstance(x[1], dict)
-                        else 999
-                    ),
-                )
-            elif isinstance(rules, list):
-                sorted_rules = [(f"rule_{i}", rule) for i, rule in enumerate(rules)]
-            else:
-                sorted_rules = []
-        except Exception as e:
-            print(f"ERROR in _format_focused_detection: {e}")
-            print(f"area={area}, rules type={type(rules)}")
-            raise
-
-        for rule_name, rule_data in sorted_rules:
-            if not isinstance(rule_data, dict):
-                continue
+    def format_principles(
+        self, principles: dict[str, Any], focus_areas: list[str] | None = None
+    ) -> str:
+        """Format principles for prompt"""
+        if not isinstance(principles, dict):
+            return f"{_PRIORITY_LINE}\n**Principles:** Unable to parse principles structure"
 
-            severity = rule_data.get("severity", "unknown")
-            description = rule_data.get("description", "")
+        return self._format_principle_records(
+            normalize_principles(_focus_principles(principles, focus_areas))
+        )
 
-            output.append(
-                f"- **{rule_name.replace('_', ' ').title()}** ({severity.title()}): {description}"
-            )
+    def _format_principle_records(self, records: Iterable[Principle]) -> str:
+        """Format already-normalized principles under the priority line"""
+        buf = _Writer()
+        buf.line(_PRIORITY_LINE)
+
+        for principle in records:
+            buf.line(f"### {_title(principle.name)}")
+            buf.line(f"**Why:** {principle.why}")
+
+            if principle.how is not None:
+                buf.line("**How:**")
+                for item in principle.how:
+                    buf.line(f"- {item}")
+
+            buf.line()
+
+        return buf.getvalue()
+
+    def format_platform_requirements(self, platform_config: dict[str, Any]) -> str:
+        """Format platform-specific requirements"""
+        buf = _Writer()
+
+        if requirements := platform_config.get("requirements"):
+            buf.line("**Requirements:**")
+            buf.lines(f"- {req}" for req in requirements)
+            buf.line()
+
+        if approved_deps := platform_config.get("approved_dependencies"):
+            buf.line("**Approved Dependencies:**")
+            for category, deps in approved_deps.items():
+                if type(deps) is list:
+                    buf.lines(_approved_dependency_line(dep_info, category) for dep_info in deps)
+            buf.line()
+
+        if required_tools := platform_config.get("tools"):
+            buf.line("**Required Tools:**")
+            for category, tools in required_tools.items():
+                if type(tools) is list:
+                    buf.lines(f"- {tool} ({category})" for tool in tools)
+                else:
+                    buf.line(f"- {tools} ({category})")
 
-            patterns = rule_data.get("patterns", [])
-            if isinstance(patterns, list):
-                for pattern_data in patterns:
-                    if isinstance(pattern_data, dict) and "regex" in pattern_data:
-                        regex = pattern_data["regex"]
-                        message = pattern_data.get("message", "")
-                        output.append(f"  - `{regex}` → {message}")
-            elif isinstance(patterns, dict):
-                for pattern_name, pattern_data in patterns.items():
-                    if isinstance(pattern_data, dict) and "regex" in pattern_data:
-                        regex = pattern_data["regex"]
-                        message = pattern_data.get("message", "")
-                        output.append(f"  - `{regex}` → {message}")
-                    elif isinstance(pattern_data, dict) and "message" in pattern_data:
-                        # Handle patterns that don't have regex but have message
-                        message = pattern_data.get("message", "")
-                        output.append(f"  - {pattern_name.replace('_', ' ').title()}: {message}")
-
-        return "\n".join(output)
+        return buf.getvalue()
+
+    def format_detection_rules(self, rules: dict[str, Any], platform: str | None = None) -> str:
+        """Format detection rules for prompt inclusion, optionally for a single platform"""
+        buf = _Writer()
+        platforms = (platform,) if platform else _PLATFORMS
+
+        for category, category_rules in rules.items():
+            buf.line(f"### {_title(category)} Rules")
+
+            if type(category_rules) is dict and "rules" in category_rules:
+                category_rules = category_rules["rules"]
+            if type(category_rules) is not dict:
+                category_rules = {}
+
+            for rule_name, rule_data in category_rules.items():
+                if type(rule_data) is not dict:
+                    continue
+
+                severity = rule_data.get("severity", "unknown")
+                buf.line(f"**{_pretty(rule_name)}** (Severity: {severity})")
+                buf.line(f"- {rule_data.get('description', 'No description')}")
+
+                # Only the first three patterns are shown; stop scanning after them
+                patterns_to_show = list(islice(_listed_patterns(rule_data, platforms), 3))
+                if patterns_to_show:
+                    buf.line("- Detection patterns:")
+                    for pattern in patterns_to_show:
+                        if type(pattern) is dict and "regex" in pattern:
+                            buf.line(f"  - `{pattern['regex']}`")
+                            if "message" in pattern:
+                                buf.line(f"    - {pattern['message']}")
+                        else:
+                            buf.line(f"  - `{pattern}`")
+
+                buf.line()
+
+            buf.line()
+
+        return buf.getvalue()
+
+    def format_severity_levels(self, severity: dict[str, Any]) -> str:
+        """Format severity levels for prompt inclusion"""
+        buf = _Writer()
+
+        for level in _SEVERITY_LEVELS:
+            if level in severity:
+                level_data = severity[level]
+                if type(level_data) is dict:
+                    description = level_data.get("description", f"{_title(level)} violations")
+                    action = level_data.get("action", "See documentation")
+                    llm_instructions = level_data.get("llm_instructions", "")
+                    examples = level_data.get("examples", [])
+
+                    buf.line(f"- **{_title(level)}**: {description}")
+                    buf.line(f"  - Action: {action}")
+
+                    if llm_instructions:
+                        buf.line(f"  - AI Guidance: {llm_instructions}")
+
+                    if examples:
+                        buf.line("  - Examples:")
+                        for example in examples[:3]:
+                            buf.line(f"    - {example}")
+                else:
+                    buf.line(f"- **{_title(level)}**: {level_data}")
+
+        return buf.getvalue()
+
+    def generate_review_prompt(self, platform: str, focus_areas: list[str]) -> str:
+        """Generate code review prompt"""
+
+        platform_title = self.loader.get_platform_title(platform)
+        severity_levels = self.ctx.severity_levels
+
+        detection_sections = []
+        for area in focus_areas:
+            rules = self._load_detection_rules(area, platform)
+            if rules:
+                detection_sections.append(self._format_focused_detection(area, rules))
+        detection_section = "\n".join(detection_sections)
+
+        enforcement_section = self._format_enforcement_context(focus_areas)
+
+        severity_section = self.format_severity_levels(severity_levels)
+
+        return _REVIEW_PROMPT.format(
+            platform=platform,
+            platform_title=platform_title,
+            focus=",".join(focus_areas),
+            focus_list=", ".join(focus_areas),
+            detection_section=detection_section,
+            severity_section=severity_section,
+            enforcement_section=enforcement_section,
+        )
+
+    def _format_philosophy(self, philosophy: dict[str, Any]) -> str:
+        """Format philosophy for prompt inclusion"""
+        buf = _Writer()
+
+        if mantras := philosophy.get("mantras"):
+            buf.line("**Mantras**:")
+            for mantra in mantras:
+                principle = mantra.get("principle", "")
+                explanation = mantra.get("explanation", "")
+                if principle:
+                    buf.line(f"- *{principle}* - {explanation}")
+            buf.line()
+
+        if core_values := philosophy.get("core_values"):
+            values_list = []
+            for category, values in core_values.items():
+                if type(values) is list and values:
+                    values_list.append(f"{_title(category)}: {values[0]}")
+            if values_list:
+                buf.line(f"**Values**: {', '.join(values_list)}")
+                buf.line()
+
+        return buf.getvalue()
+
+    def _format_enforcement_context(self, focus_areas: list[str]) -> str:
+        """Format enforcement context showing what CI will check"""
+        buf = _Writer()
+
+        enforcement = self.ctx.enforcement
+        ci_pipeline = enforcement.get("enforcement_tools", {}).get("ci_pipeline", {})
+        stages = ci_pipeline.get("stages", [])
+
+        relevant_stages = map_focus_areas_to_enforcement_stages(focus_areas)
+
+        for stage in stages:
+            stage_name = stage.get("name", "")
+            if stage_name in relevant_stages:
+                checks = stage.get("checks", [])
+                if checks:
+                    buf.line(f"**{_title(stage_name)} Stage**:")
+                    for check in checks[:3]:
+                        buf.line(f"- {check}")
+                    buf.line()
+
+        return buf.getvalue()
+
+    def _format_generation_guidance(
+        self, guidance: dict[str, Any], component_type: str, platform: str
+    ) -> str:
+        """Format generation guidance from YAML"""
+        buf = _Writer()
+
+        focus_areas = _COMPONENT_FOCUS_AREAS.get(component_type, ["architecture"])
+
+        principle_guidance = guidance.get("principle_guidance", {})
+        for area in focus_areas:
+            if (area_data := principle_guidance.get(area)) is not None:
+                buf.line(f"### {_title(area)}")
+
+                if approach := area_data.get("approach"):
+                    buf.line(f"**Approach**: {approach}")
+                    buf.line()
+
+                if platform_data := area_data.get(platform):
+                    if always := platform_data.get("always"):
+                        buf.line("**Always**:")
+                        for item in always:
+                            buf.line(f"- {item}")
+                        buf.line()
+
+                    if never := platform_data.get("never"):
+                        buf.line("**Never**:")
+                        for item in never:
+                            buf.line(f"- {item}")
+                        buf.line()
+
+        common_mistakes = guidance.get("common_mistakes", {})
+        if focus_areas and common_mistakes:
+            buf.line("### Common Mistakes to Avoid")
+            for area in focus_areas:
+                if mistakes := common_mistakes.get(area):
+                    for mistake in mistakes[:3]:  # Top 3
+                        buf.line(f"- {mistake}")
+            buf.line()
+
+        return buf.getvalue()
+
+    def generate_code_prompt(self, platform: str, component_type: str) -> str:
+        """Generate code writing prompt"""
+        principles, platform_title, platform_config = self._common_prompt_data(platform)
+        philosophy_data = self.ctx.philosophy
+        guidance = self.ctx.guidance
+
+        focus_principles = _COMPONENT_PRINCIPLES.get(component_type, ["code_consistency"])
+
+        philosophy_section = self._format_philosophy(philosophy_data)
+        records = self.ctx.principle_records
+        principles_section = self._format_principle_records(
+            records[name]
+            for name in _focus_principles(principles, focus_principles)
+            if name in records
+        )
+        platform_section = self.format_platform_requirements(platform_config)
+        guidance_section = self._format_generation_guidance(guidance, component_type, platform)
+
+        return _CODE_PROMPT.format(
+            platform=platform,
+            platform_title=platform_title,
+            component_type=component_type,
+            component_title=_title(component_type),
+            philosophy_section=philosophy_section,
+            principles_section=principles_section,
+            platform_section=platform_section,
+            guidance_section=guidance_section,
+        )
+
+    def generate_dependency_prompt(self, platform: str, dependencies: list[str]) -> str:
+        """Generate dependency evaluation prompt"""
+        principles, platform_title, _ = self._common_prompt_data(platform)
+        index = self.ctx.dependency_index(platform)
+
+        status_section = "\n".join(
+            _format_dependency_status(dep, index.match(dep)) for dep in dependencies
+        )
+        approved_section = "\n".join(f"- {dep}" for dep in index.names)
+
+        minimal_deps_principle = principles.get("minimal_dependencies", {})
+        minimal_deps_why = minimal_deps_principle.get(
+            "why", "We're responsible for maintaining every single line of code we ship"
+        )
+
+        return _DEPENDENCY_PROMPT.format(
+            platform=platform,
+            platform_title=platform_title,
+            dependency_names=",".join(dependencies),
+            minimal_deps_why=minimal_deps_why,
+            status_section=status_section,
+            approved_section=approved_section,
+        )
+
+    def generate_architecture_prompt(self, platform: str, layer: str) -> str:
+        """Generate architecture guidance prompt"""
+        principles, platform_title, platform_config = self._common_prompt_data(platform)
+
+        arch_principles = self._format_focused_architecture(
+            principles, ["unidirectional_data_flow", "minimal_dependencies", "testing"]
+        )
+
+        platform_reqs = self._format_concise_platform(platform_config, platform_title)
+
+        return _ARCHITECTURE_PROMPT.format(
+            platform=platform,
+            platform_title=platform_title,
+            layer=layer,
+            layer_title=_title(layer),
+            arch_principles=arch_principles,
+            platform_reqs=platform_reqs,
+        )
+
+    def _format_focused_detection(self, area: str, rules: dict[str, Any]) -> str:
+        """Format focused detection patterns for a specific area"""
+        table = _normalize_rules(rules)
+        rank = _SEVERITY_RANK.get
+        ranks = [rank(severity, len(_SEVERITY_LEVELS)) for severity in table.severities]
+        order: Iterable[int] = range(len(ranks))
+        if type(rules) is dict:
+            order = sorted(order, key=ranks.__getitem__)
+
+        rule_lines = (line for i in order for line in _focused_rule_lines(table, i))
+        return "\n".join(chain((f"## {_title(area)} Detection",), rule_lines))
 
     def _load_detection_rules(self, area: str, platform: str | None = None) -> dict[str, Any]:
         """Load detection rules from YAML files"""
-        detection_file = self.loader.modules_path / "detection" / "rules" / f"{area}.yaml"
-
-        if not detection_file.exists():
+        detection_data = self.ctx.detection_file(area)
+        if not detection_data:
             return {}
 
-        detection_data = self.loader.load_yaml(detection_file)
         rules = detection_data.get("rules", {})
 
         if platform:
             filtered_rules = {}
             for rule_name, rule_data in rules.items():
-                if not isinstance(rule_data, dict):
+                if type(rule_data) is not dict:
                     continue
 
-                filtered_rule = rule_data.copy()
-
-                platform_patterns = rule_data.get(f"{platform}_patterns", [])
-                if platform_patterns:
-                    if "patterns" not in filtered_rule:
-                        filtered_rule["patterns"] = []
-                    elif not isinstance(filtered_rule["patterns"], list):
-                        filtered_rule["patterns"] = []
-
-                    if isinstance(platform_patterns, list):
-                        for pattern_data in platform_patterns:
-                            if isinstance(pattern_data, dict):
-                                filtered_rule["patterns"].append(pattern_data)
-                    elif isinstance(platform_patterns, dict):
-                        for _pattern_name, pattern_data in platform_patterns.items():
-                            if isinstance(pattern_data, dict):
-                                filtered_rule["patterns"].append(pattern_data)
+                platform_patterns = rule_data.get(f"{platform}_patterns")
+                if not platform_patterns:
+                    # Formatters only read rules, so unchanged ones share the cached YAML
+                    filtered_rules[rule_name] = rule_data
+                    continue
 
-                filtered_rules[rule_name] = filtered_rule
+                # Merge into a new dict and list; rule_data is shared with the cached YAML
+                base_patterns = rule_data.get("patterns")
+                filtered_rules[rule_name] = {
+                    **rule_data,
+                    "patterns": [
+                        *(base_patterns if type(base_patterns) is list else []),
+                        *(entry for _name, entry in _pattern_entries(platform_patterns)),
+                    ],
+                }
 
             return filtered_rules
 
         return dict(rules)
 
+    def _common_prompt_data(self, platform: str) -> tuple[dict[str, Any], str, dict[str, Any]]:
+        """Principles, display title and platform config from the shared context"""
+        platform_title = self.loader.get_platform_title(platform)
+        platform_config = self.ctx.platforms.get(platform, {})
+        return self.ctx.principles, platform_title, platform_config
+
     def _format_concise_platform(self, platform_config: dict[str, Any], platform_title: str) -> str:
         """Format concise platform requirements"""
-        output = [f"## Platform Requirements ({platform_title})"]
+        buf = _Writer()
+        buf.line(f"## Platform Requirements ({platform_title})")
 
-        if "approved_dependencies" in platform_config:
+        if approved_deps := platform_config.get("approved_dependencies"):
             deps_by_category = {}
-            for category, dep_list in platform_config["approved_dependencies"].items():
-                if isinstance(dep_list, list):
+            for category, dep_list in approved_deps.items():
+                if type(dep_list) is list:
                     category_deps = []
                     for dep in dep_list:
-                        if isinstance(dep, dict) and "name" in dep:
+                        if type(dep) is dict and "name" in dep:
                             category_deps.append(dep["name"])
                         else:
                             category_deps.append(str(dep))
@@ -614,112 +901,153 @@ Provide specific structure and implementation recommendations.
                         deps_by_category[category] = category_deps
 
             for category, deps in deps_by_category.items():
-                output.append(f"- **{category.title()}**: {', '.join(deps)}")
+                buf.line(f"- **{_title(category)}**: {', '.join(deps)}")
 
-        if "tools" in platform_config:
+        if required_tools := platform_config.get("tools"):
             tools_by_category = {}
-            for category, tool_list in platform_config["tools"].items():
-                if isinstance(tool_list, list):
+            for category, tool_list in required_tools.items():
+                if type(tool_list) is list:
                     tools_by_category[category] = tool_list
                 else:
                     tools_by_category[category] = [tool_list]
 
             for category, tools in tools_by_category.items():
-                output.append(f"- **{category.title()}**: {', '.join(tools)}")
+                buf.line(f"- **{_title(category)}**: {', '.join(tools)}")
 
-        return "\n".join(output)
+        return buf.getvalue()
 
     def _format_focused_architecture(
         self, principles: dict[str, Any], focus_principles: list[str]
     ) -> str:
         """Format focused architecture principles"""
-        output = ["## Architecture Principles"]
+        buf = _Writer()
+        buf.line("## Architecture Principles")
 
         for principle_name in focus_principles:
             if principle_name not in principles:
                 continue
 
             principle = principles[principle_name]
-            if not isinstance(principle, dict):
+            if type(principle) is not dict:
                 continue
 
             why = principle.get("why", "")
             how = principle.get("how", "")
 
-            display_name = (
-                principle_name.replace("_", " ").title().replace("Data Flow", "Data_Flow")
-            )
-            output.append(f"- **{display_name}**: {why}")
+            # One buffer write per principle: the summary line joins onto its header
+            block = f"- **{_display_name(principle_name)}**: {why}"
 
-            if isinstance(how, list):
-                key_points = [point.strip("- ") for point in how if point.strip()]
+            if type(how) is list:
+                # Only the first three points are shown
+                key_points = list(islice((text for point in how if (text := point.strip("- "))), 3))
                 if key_points:
-                    if len(key_points) <= 3:
-                        output.append(f"  - {' • '.join(key_points)}")
-                    else:
-                        output.append(f"  - {' • '.join(key_points[:3])}")
-            elif isinstance(how, str) and how:
-                first_sentence = how.split(".")[0]
+                    block += f"\n  - {_BULLET_SEP.join(key_points)}"
+            elif type(how) is str and how:
+                first_sentence = how.partition(".")[0]
                 if first_sentence:
-                    output.append(f"  - {first_sentence}")
+                    block += f"\n  - {first_sentence}"
 
-        return "\n".join(output)
+            buf.line(block)
 
+        return buf.getvalue()
 
-def main() -> None:
-    cli = PrinciplesCLI()
 
-    parser = argparse.ArgumentParser(
-        description="Generate prompts for engineering standards",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
+def _add_review_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--platform", choices=_PLATFORMS, required=True)
+    parser.add_argument("--focus", default="security,accessibility,testing")
+    parser.add_argument(
+        "--enhanced", action="store_true", help="Enhance with LLM (requires OPENAI_API_KEY)"
     )
 
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
 
-    review_parser = subparsers.add_parser("review", help="Generate review prompt")
-    review_parser.add_argument("--platform", choices=["android", "ios", "web"], required=True)
-    review_parser.add_argument("--focus", default="security,accessibility,testing")
-    review_parser.add_argument(
+def _add_generate_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--platform", choices=_PLATFORMS, required=True)
+    parser.add_argument("--component", default="ui")
+    parser.add_argument(
         "--enhanced", action="store_true", help="Enhance with LLM (requires OPENAI_API_KEY)"
     )
 
-    generate_parser = subparsers.add_parser("generate", help="Generate code prompt")
-    generate_parser.add_argument("--platform", choices=["android", "ios", "web"], required=True)
-    generate_parser.add_argument("--component", default="ui")
-    generate_parser.add_argument(
-        "--enhanced", action="store_true", help="Enhance with LLM (requires OPENAI_API_KEY)"
+
+def _add_architecture_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--platform", choices=_PLATFORMS, required=True)
+    parser.add_argument("--layer", choices=["data", "ui", "business-logic"], default="data")
+
+
+def _add_dependencies_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--platform", choices=_PLATFORMS, required=True)
+    parser.add_argument("dependencies", nargs="+", help="Dependencies to evaluate")
+
+
+# Command -> (help, argument builder); only the invoked command gets its arguments
+_COMMANDS: dict[str, tuple[str, Callable[[argparse.ArgumentParser], None]]] = {
+    "review": ("Generate review prompt", _add_review_arguments),
+    "generate": ("Generate code prompt", _add_generate_arguments),
+    "architecture": ("Generate architecture prompt", _add_architecture_arguments),
+    "dependencies": ("Evaluate dependencies", _add_dependencies_arguments),
+}
+
+
+def _build_parser(argv: list[str]) -> argparse.ArgumentParser:
+    """Build the CLI parser, registering arguments only for the command in argv"""
+    parser = argparse.ArgumentParser(
+        description="Generate prompts for engineering standards",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
-    architecture_parser = subparsers.add_parser("architecture", help="Generate architecture prompt")
-    architecture_parser.add_argument("--platform", choices=["android", "ios", "web"], required=True)
-    architecture_parser.add_argument(
-        "--layer", choices=["data", "ui", "business-logic"], default="data"
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep data loaded in a background server that answers later invocations",
     )
 
-    dependency_parser = subparsers.add_parser("dependencies", help="Evaluate dependencies")
-    dependency_parser.add_argument("--platform", choices=["android", "ios", "web"], required=True)
-    dependency_parser.add_argument("dependencies", nargs="+", help="Dependencies to evaluate")
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    # The command is the first positional token; only flags like --daemon precede it
+    selected = next((arg for arg in argv if arg in _COMMANDS), None)
+    for name, (help_text, add_arguments) in _COMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if name == selected:
+            add_arguments(command_parser)
+
+    return parser
+
 
+def main() -> None:
+    parser = _build_parser(sys.argv[1:])
     args = parser.parse_args()
 
+    if args.daemon:
+        if args.command:
+            parser.error("--daemon only starts the server; run the command separately")
+        if not daemon.is_supported():
+            print("Error: daemon mode requires Unix sockets", file=sys.stderr)
+            sys.exit(1)
+        daemon.serve(PrinciplesCLI().render, daemon.get_socket_path())
+        return
+
     if not args.command:
         parser.print_help()
         return
 
+    options: dict[str, Any]
     try:
         if args.command == "review":
-            focus_areas = args.focus.split(",")
-            prompt = cli.generate_review_prompt(args.platform, focus_areas)
+            options = {"focus_areas": [sys.intern(area) for area in args.focus.split(",")]}
         elif args.command == "generate":
-            prompt = cli.generate_code_prompt(args.platform, args.component)
+            options = {"component_type": args.component}
         elif args.command == "architecture":
-            prompt = cli.generate_architecture_prompt(args.platform, args.layer)
+            options = {"layer": args.layer}
         elif args.command == "dependencies":
-            prompt = cli.generate_dependency_prompt(args.platform, args.dependencies)
+            options = {"dependencies": args.dependencies}
         else:
             parser.print_help()
             return
 
+        options["platform"] = sys.intern(args.platform)
+        prompt = daemon.forward(args.command, options, daemon.get_socket_path())
+        if prompt is None:
+            prompt = PrinciplesCLI().render(args.command, **options)
+
         # Apply enhancement if requested
         if hasattr(args, "enhanced") and args.enhanced:
             from leap.prompt_enhancer import enhance_prompt_with_llm, get_openai_client
@@ -737,7 +1065,9 @@ def main() -> None:
 
         print(prompt)
 
-    except Exception as e:
+    # Daemon errors arrive as RuntimeError; OSError covers unreadable files, and the
+    # rest come from YAML whose values have the wrong shape (e.g. a string for a mapping)
+    except (OSError, KeyError, ValueError, RuntimeError, AttributeError, TypeError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
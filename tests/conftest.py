@@ -0,0 +1,13 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+
+import eval_runner
+
+
+@pytest.fixture(scope="session")
+def prompt_evaluator() -> eval_runner.PromptEvaluator:
+    """PromptEvaluator with test cases loaded once per session; patch, don't mutate."""
+    return eval_runner.PromptEvaluator()
@@ -2,21 +2,47 @@
 Unit tests for principles_cli module.
 """
 
+import os
+import socket
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
 import pytest
 
 # Import the module to test
-from principles_cli import PrinciplesCLI
+import principles_cli
+from leap import LeapLoader, daemon
+from leap.loaders import _parse_yaml_file
+from principles_cli import PrinciplesCLI, _build_parser
+
+# Principles spanning the UI and business-logic component filters
+PRINCIPLES: dict[str, Any] = {
+    "accessibility": {"why": "Access for all", "how": ["Use ARIA"]},
+    "flexible_layout": {"why": "Responsive design", "how": ["Flexbox"]},
+    "design_integrity": {"why": "Match designs", "how": ["Follow specs"]},
+    "localization": {"why": "Global reach", "how": ["Externalize strings"]},
+    "security": {"why": "Protect users", "how": ["HTTPS only"]},
+    "testing": {"why": "Quality code", "how": ["80% coverage"]},
+    "unidirectional_data_flow": {"why": "Data flow", "how": ["One-way"]},
+    "minimal_dependencies": {"why": "Simplicity", "how": ["Avoid bloat"]},
+}
+
+
+@pytest.fixture(scope="module")
+def cli() -> PrinciplesCLI:
+    """CLI over the real data files, shared by tests that don't need FakeLeapLoader."""
+    return PrinciplesCLI()
 
 
 class TestFormatPrinciples:
     """Test cases for format_principles method."""
 
-    def test_format_principles_no_focus(self) -> None:
+    def test_format_principles_no_focus(self, cli: PrinciplesCLI) -> None:
         """Test formatting principles without focus areas."""
-        cli = PrinciplesCLI()
         principles = {
             "security": {
                 "why": "Test why",
@@ -35,9 +61,8 @@ class TestFormatPrinciples:
         assert "- Step 1" in result
         assert "- Step 2" in result
 
-    def test_format_principles_with_focus(self) -> None:
+    def test_format_principles_with_focus(self, cli: PrinciplesCLI) -> None:
         """Test formatting principles with specific focus areas."""
-        cli = PrinciplesCLI()
         principles = {
             "security": {"why": "Security matters", "how": ["Use HTTPS"]},
             "accessibility": {"why": "Access matters", "how": ["Use ARIA"]},
@@ -50,18 +75,8 @@ class TestFormatPrinciples:
         assert "### Accessibility" in result
         assert "### Testing" not in result
 
-    def test_format_principles_with_component_filter(self) -> None:
+    def test_format_principles_with_component_filter(self, cli: PrinciplesCLI) -> None:
         """Test formatting principles with component-based filtering (e.g., UI components)."""
-        cli = PrinciplesCLI()
-        principles = {
-            "accessibility": {"why": "Access matters", "how": ["Use ARIA"]},
-            "flexible_layout": {"why": "Layout matters", "how": ["Use flexbox"]},
-            "design_integrity": {"why": "Design matters", "how": ["Follow specs"]},
-            "localization": {"why": "L10n matters", "how": ["Externalize strings"]},
-            "security": {"why": "Security matters", "how": ["Use HTTPS"]},
-            "testing": {"why": "Testing matters", "how": ["Write tests"]},
-            "unidirectional_data_flow": {"why": "Data flow matters", "how": ["One-way"]},
-        }
         # UI component principles (like what generate_code_prompt passes)
         ui_principles = [
             "accessibility",
@@ -71,7 +86,7 @@ class TestFormatPrinciples:
             "security",
         ]
 
-        result = cli.format_principles(principles, ui_principles)
+        result = cli.format_principles(PRINCIPLES, ui_principles)
         assert "### Accessibility" in result
         assert "### Flexible_Layout" in result
         assert "### Design_Integrity" in result
@@ -81,9 +96,8 @@ class TestFormatPrinciples:
         assert "### Testing" not in result
         assert "### Unidirectional_Data_Flow" not in result
 
-    def test_format_principles_missing_fields(self) -> None:
+    def test_format_principles_missing_fields(self, cli: PrinciplesCLI) -> None:
         """Test formatting principles with missing fields."""
-        cli = PrinciplesCLI()
         principles = {
             "security": {
                 "why": "Test why"
@@ -95,14 +109,19 @@ class TestFormatPrinciples:
         assert "### Security" in result
         assert "**Why:** Test why" in result
         # Should handle missing fields gracefully
+        assert "**How:**" not in result
+
+    def test_format_principles_empty_how(self, cli: PrinciplesCLI) -> None:
+        """Test that a present but empty how list still gets its heading."""
+        result = cli.format_principles({"security": {"why": "Test why", "how": []}})
+        assert "**Why:** Test why\n**How:**\n" in result
 
 
 class TestFormatPlatformRequirements:
     """Test cases for format_platform_requirements method."""
 
-    def test_format_platform_requirements_ios(self) -> None:
+    def test_format_platform_requirements_ios(self, cli: PrinciplesCLI) -> None:
         """Test formatting iOS platform requirements."""
-        cli = PrinciplesCLI()
         platform_config = {
             "approved_dependencies": {"frameworks": ["UIKit", "Foundation", "Core Data"]},
             "tools": {"linting": ["SwiftLint"], "testing": ["XCTest", "Quick/Nimble"]},
@@ -116,9 +135,8 @@ class TestFormatPlatformRequirements:
         assert "- SwiftLint (linting)" in result
         assert "- XCTest (testing)" in result
 
-    def test_format_platform_requirements_android(self) -> None:
+    def test_format_platform_requirements_android(self, cli: PrinciplesCLI) -> None:
         """Test formatting Android platform requirements with detailed dependencies."""
-        cli = PrinciplesCLI()
         platform_config = {
             "approved_dependencies": {
                 "architecture": [
@@ -144,9 +162,8 @@ class TestFormatPlatformRequirements:
         assert "- RxJava2 v2.x - Reactive programming (reactive)" in result
         assert "- ktlint (linting)" in result
 
-    def test_format_platform_requirements_empty(self) -> None:
+    def test_format_platform_requirements_empty(self, cli: PrinciplesCLI) -> None:
         """Test formatting empty platform requirements."""
-        cli = PrinciplesCLI()
         result = cli.format_platform_requirements({})
         assert result == ""
 
@@ -154,9 +171,8 @@ class TestFormatPlatformRequirements:
 class TestFormatDetectionRules:
     """Test cases for format_detection_rules method."""
 
-    def test_format_detection_rules_basic(self) -> None:
+    def test_format_detection_rules_basic(self, cli: PrinciplesCLI) -> None:
         """Test formatting basic detection rules."""
-        cli = PrinciplesCLI()
         rules = {
             "security": {
                 "hardcoded_secrets": {
@@ -180,9 +196,8 @@ class TestFormatDetectionRules:
         assert "api_key.*=.*['\"][^'\"]+['\"]" in result
         assert "API key found" in result
 
-    def test_format_detection_rules_nested_patterns(self) -> None:
+    def test_format_detection_rules_nested_patterns(self, cli: PrinciplesCLI) -> None:
         """Test formatting rules with nested pattern structures."""
-        cli = PrinciplesCLI()
         rules = {
             "security": {
                 "insecure_storage": {
@@ -204,9 +219,83 @@ class TestFormatDetectionRules:
         assert "- Detection patterns:" in result
         assert "SharedPreferences.*password" in result
 
-    def test_format_detection_rules_empty(self) -> None:
+    def test_format_detection_rules_platform(self, cli: PrinciplesCLI) -> None:
+        """Test that only the requested platform's patterns are included."""
+        rules = {
+            "security": {
+                "insecure_storage": {
+                    "description": "Detect insecure storage",
+                    "severity": "critical",
+                    "android_patterns": {
+                        "prefs": {"regex": "SharedPreferences.*password", "message": "Prefs"}
+                    },
+                    "ios_patterns": {
+                        "defaults": {"regex": "UserDefaults.*password", "message": "Defaults"}
+                    },
+                }
+            }
+        }
+
+        result = cli.format_detection_rules(rules, platform="ios")
+        assert "UserDefaults.*password" in result
+        assert "SharedPreferences.*password" not in result
+
+    def test_format_detection_rules_pattern_shapes(self, cli: PrinciplesCLI) -> None:
+        """Test which pattern shapes are listed, capped at three."""
+        rules = {
+            "security": {
+                "insecure_storage": {
+                    "description": "Detect insecure storage",
+                    "severity": "critical",
+                    "patterns": ["password.*="],
+                    "android_patterns": [
+                        {"regex": "SharedPreferences.*password", "message": "Prefs"}
+                    ],
+                    "ios_patterns": {
+                        "defaults": {"regex": "UserDefaults.*password", "message": "Defaults"},
+                        "keychain": {"message": "No regex"},
+                        "plist": {"regex": "plist.*password"},
+                        "file": {"regex": "write.*password"},
+                    },
+                }
+            }
+        }
+
+        result = cli.format_detection_rules(rules)
+        assert result.splitlines()[3:9] == [
+            "- Detection patterns:",
+            "  - `password.*=`",
+            "  - `UserDefaults.*password`",
+            "    - Defaults",
+            "  - `plist.*password`",
+            "",
+        ]
+
+    def test_format_focused_detection_pattern_shapes(self, cli: PrinciplesCLI) -> None:
+        """Test focused detection keys off which pattern keys are present."""
+        rules = {
+            "r": {
+                "severity": "critical",
+                "patterns": {"a": {"regex": None, "message": "m"}, "b": {"message": ""}},
+            },
+            "s": {
+                "severity": "required",
+                "patterns": [{"regex": None, "message": "x"}, {"message": "listed"}],
+            },
+        }
+
+        result = cli._format_focused_detection("security", rules)
+        assert result.splitlines() == [
+            "## Security Detection",
+            "- **R** (Critical): ",
+            "  - `None` → m",
+            "  - B: ",
+            "- **S** (Required): ",
+            "  - `None` → x",
+        ]
+
+    def test_format_detection_rules_empty(self, cli: PrinciplesCLI) -> None:
         """Test formatting empty detection rules."""
-        cli = PrinciplesCLI()
         result = cli.format_detection_rules({})
         assert result == ""
 
@@ -214,9 +303,8 @@ class TestFormatDetectionRules:
 class TestFormatSeverityLevels:
     """Test cases for format_severity_levels method."""
 
-    def test_format_severity_levels_complete(self) -> None:
+    def test_format_severity_levels_complete(self, cli: PrinciplesCLI) -> None:
         """Test formatting complete severity levels."""
-        cli = PrinciplesCLI()
         severity = {
             "critical": {
                 "description": "Immediate harm to users",
@@ -237,46 +325,67 @@ class TestFormatSeverityLevels:
         assert "- **Blocking**: Break engineering standards" in result
         assert "    - Test coverage below 80%" in result
 
-    def test_format_severity_levels_minimal(self) -> None:
+    def test_format_severity_levels_minimal(self, cli: PrinciplesCLI) -> None:
         """Test formatting minimal severity levels."""
-        cli = PrinciplesCLI()
         severity = {"critical": {"description": "Critical issues"}}
 
         result = cli.format_severity_levels(severity)
         assert "- **Critical**: Critical issues" in result
         assert "Action: See documentation" in result
 
-    def test_format_severity_levels_empty(self) -> None:
+    def test_format_severity_levels_empty(self, cli: PrinciplesCLI) -> None:
         """Test formatting empty severity levels."""
-        cli = PrinciplesCLI()
         result = cli.format_severity_levels({})
         assert result == ""
 
 
+class FakeLeapLoader(LeapLoader):
+    """LeapLoader serving in-memory data; files under base_path don't exist."""
+
+    def __init__(self, base_path: Path) -> None:
+        super().__init__(base_path)
+        self.principles: dict[str, Any] = {}
+        self.platforms: dict[str, Any] = {}
+        self.philosophy: dict[str, Any] = {}
+        self.severity_levels: dict[str, Any] = {}
+        self.calls: Counter[str] = Counter()
+
+    def load_principles(self) -> dict[str, Any]:
+        self.calls["principles"] += 1
+        return self.principles
+
+    def load_platforms(self) -> dict[str, Any]:
+        self.calls["platforms"] += 1
+        return self.platforms
+
+    def load_philosophy(self) -> dict[str, Any]:
+        return self.philosophy
+
+    def load_enforcement(self) -> dict[str, Any]:
+        return {}
+
+    def load_severity_levels(self) -> dict[str, Any]:
+        return self.severity_levels
+
+
+@pytest.fixture
+def fake_loader(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeLeapLoader:
+    """FakeLeapLoader that PrinciplesCLI() picks up instead of reading YAML."""
+    loader = FakeLeapLoader(tmp_path)
+    monkeypatch.setattr(principles_cli, "LeapLoader", lambda: loader)
+    return loader
+
+
 class TestGenerateReviewPrompt:
     """Test cases for generate_review_prompt method."""
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_review_prompt_basic(self, mock_loader_class: Any) -> None:
+    def test_generate_review_prompt_basic(self, fake_loader: FakeLeapLoader) -> None:
         """Test generating basic review prompt."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        mock_loader.load_principles.return_value = {
-            "security": {"why": "Security matters", "how": ["Use HTTPS"]}
-        }
-        mock_loader.load_platforms.return_value = {
-            "web": {"approved_dependencies": {"framework": ["React"]}}
-        }
-        mock_loader.load_severity_levels.return_value = {
+        fake_loader.principles = {"security": {"why": "Security matters", "how": ["Use HTTPS"]}}
+        fake_loader.platforms = {"web": {"approved_dependencies": {"framework": ["React"]}}}
+        fake_loader.severity_levels = {
             "critical": {"description": "Critical issues", "action": "Block"}
         }
-        mock_loader.load_detection_rules.return_value = {
-            "hardcoded_secrets": {
-                "description": "Find secrets",
-                "severity": "critical",
-            }
-        }
-        mock_loader.get_platform_title.return_value = "Web"
 
         cli = PrinciplesCLI()
         result = cli.generate_review_prompt("web", ["security"])
@@ -289,16 +398,11 @@ class TestGenerateReviewPrompt:
         # Check for main content
         assert "# Code Review Assistant for Web" in result
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_review_prompt_missing_rule_file(self, mock_loader_class: Any) -> None:
+    def test_generate_review_prompt_missing_rule_file(self, fake_loader: FakeLeapLoader) -> None:
         """Test generating prompt when rule file doesn't exist."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        mock_loader.load_principles.return_value = {"security": {"why": "Security matters"}}
-        mock_loader.load_platforms.return_value = {"ios": {"tools": {"linting": ["SwiftLint"]}}}
-        mock_loader.load_severity_levels.return_value = {"critical": {"description": "Critical"}}
-        mock_loader.load_detection_rules.return_value = {}
-        mock_loader.get_platform_title.return_value = "iOS"
+        fake_loader.principles = {"security": {"why": "Security matters"}}
+        fake_loader.platforms = {"ios": {"tools": {"linting": ["SwiftLint"]}}}
+        fake_loader.severity_levels = {"critical": {"description": "Critical"}}
 
         cli = PrinciplesCLI()
         result = cli.generate_review_prompt("ios", ["nonexistent"])
@@ -311,24 +415,22 @@ class TestGenerateReviewPrompt:
         # Check for main content
         assert "# Code Review Assistant for iOS" in result
 
+    def test_generate_review_prompt_repeatable(self, cli: PrinciplesCLI) -> None:
+        """Test that platform pattern merging doesn't leak into the shared rule data."""
+        first = cli.generate_review_prompt("android", ["security"])
+        second = cli.generate_review_prompt("android", ["security"])
+
+        assert first == second
+
 
 class TestGenerateCodePrompt:
     """Test cases for generate_code_prompt method."""
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_code_prompt_basic(self, mock_loader_class: Any) -> None:
+    def test_generate_code_prompt_basic(self, fake_loader: FakeLeapLoader) -> None:
         """Test generating basic code generation prompt."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        mock_loader.load_principles.return_value = {"security": {"why": "Security matters"}}
-        mock_loader.load_platforms.return_value = {"android": {"tools": {"linting": ["ktlint"]}}}
-        mock_loader.load_philosophy.return_value = {"description": "Build excellent software"}
-        mock_loader.get_platform_title.return_value = "Android"
-        mock_loader.get_common_prompt_data.return_value = (
-            {"security": {"why": "Security matters"}},
-            "Android",
-            {"tools": {"linting": ["ktlint"]}},
-        )
+        fake_loader.principles = {"security": {"why": "Security matters"}}
+        fake_loader.platforms = {"android": {"tools": {"linting": ["ktlint"]}}}
+        fake_loader.philosophy = {"description": "Build excellent software"}
 
         cli = PrinciplesCLI()
         result = cli.generate_code_prompt("android", "ui")
@@ -341,29 +443,11 @@ class TestGenerateCodePrompt:
         # Check for main content
         assert "# Code Generation for Android" in result
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_code_prompt_ui_filtering(self, mock_loader_class: Any) -> None:
+    def test_generate_code_prompt_ui_filtering(self, fake_loader: FakeLeapLoader) -> None:
         """Test that UI component generation only includes relevant principles."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        principles = {
-            "accessibility": {"why": "Access for all", "how": ["Use ARIA"]},
-            "flexible_layout": {"why": "Responsive design", "how": ["Flexbox"]},
-            "design_integrity": {"why": "Match designs", "how": ["Follow specs"]},
-            "localization": {"why": "Global reach", "how": ["Externalize strings"]},
-            "security": {"why": "Protect users", "how": ["HTTPS only"]},
-            "testing": {"why": "Quality code", "how": ["80% coverage"]},
-            "unidirectional_data_flow": {"why": "Data flow", "how": ["One-way"]},
-        }
-        mock_loader.load_principles.return_value = principles
-        mock_loader.load_philosophy.return_value = {"description": "Build excellent software"}
-        mock_loader.load_platforms.return_value = {"android": {"tools": {"linting": ["ktlint"]}}}
-        mock_loader.get_platform_title.return_value = "Android"
-        mock_loader.get_common_prompt_data.return_value = (
-            principles,
-            "Android",
-            {"tools": {"linting": ["ktlint"]}},
-        )
+        fake_loader.principles = PRINCIPLES
+        fake_loader.philosophy = {"description": "Build excellent software"}
+        fake_loader.platforms = {"android": {"tools": {"linting": ["ktlint"]}}}
 
         cli = PrinciplesCLI()
         result = cli.generate_code_prompt("android", "ui")
@@ -377,28 +461,13 @@ class TestGenerateCodePrompt:
         assert "# Code Generation for Android Ui" in result
         assert "## Engineering Principles" in result
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_code_prompt_business_logic_filtering(self, mock_loader_class: Any) -> None:
+    def test_generate_code_prompt_business_logic_filtering(
+        self, fake_loader: FakeLeapLoader
+    ) -> None:
         """Test that business logic component generation only includes relevant principles."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        principles = {
-            "accessibility": {"why": "Access for all", "how": ["Use ARIA"]},
-            "testing": {"why": "Quality code", "how": ["80% coverage"]},
-            "unidirectional_data_flow": {"why": "Data flow", "how": ["One-way"]},
-            "minimal_dependencies": {"why": "Simplicity", "how": ["Avoid bloat"]},
-            "security": {"why": "Protect users", "how": ["HTTPS only"]},
-            "flexible_layout": {"why": "Responsive design", "how": ["Flexbox"]},
-        }
-        mock_loader.load_principles.return_value = principles
-        mock_loader.load_philosophy.return_value = {"description": "Build excellent software"}
-        mock_loader.load_platforms.return_value = {"android": {"tools": {"testing": ["JUnit"]}}}
-        mock_loader.get_platform_title.return_value = "Android"
-        mock_loader.get_common_prompt_data.return_value = (
-            principles,
-            "Android",
-            {"tools": {"testing": ["JUnit"]}},
-        )
+        fake_loader.principles = PRINCIPLES
+        fake_loader.philosophy = {"description": "Build excellent software"}
+        fake_loader.platforms = {"android": {"tools": {"testing": ["JUnit"]}}}
 
         cli = PrinciplesCLI()
         result = cli.generate_code_prompt("android", "business-logic")
@@ -416,21 +485,10 @@ class TestGenerateCodePrompt:
 class TestArchitecturePrompt:
     """Test cases for generate_architecture_prompt method."""
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_architecture_prompt_basic(self, mock_loader_class: Any) -> None:
+    def test_generate_architecture_prompt_basic(self, fake_loader: FakeLeapLoader) -> None:
         """Test generating basic architecture prompt."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        principles = {"architecture": {"why": "Good structure matters"}}
-        platform_config = {"approved_dependencies": {"framework": ["React"]}}
-        mock_loader.load_principles.return_value = principles
-        mock_loader.load_platforms.return_value = {"web": platform_config}
-        mock_loader.get_platform_title.return_value = "Web"
-        mock_loader.get_common_prompt_data.return_value = (
-            principles,
-            "Web",
-            platform_config,
-        )
+        fake_loader.principles = {"architecture": {"why": "Good structure matters"}}
+        fake_loader.platforms = {"web": {"approved_dependencies": {"framework": ["React"]}}}
 
         cli = PrinciplesCLI()
         result = cli.generate_architecture_prompt("web", "data")
@@ -447,54 +505,37 @@ class TestArchitecturePrompt:
 class TestDependencyPrompt:
     """Test cases for generate_dependency_prompt method."""
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_dependency_prompt_approved(self, mock_loader_class: Any) -> None:
+    def test_generate_dependency_prompt_approved(self, fake_loader: FakeLeapLoader) -> None:
         """Test generating dependency prompt for libraries."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        principles = {"dependencies": {"why": "Minimize dependencies"}}
-        platform_config = {
-            "approved_dependencies": {
-                "reactive": [
-                    {
-                        "name": "RxJava2",
-                        "purpose": "Reactive programming",
-                        "version": "2.x",
-                    }
-                ]
+        fake_loader.principles = {"dependencies": {"why": "Minimize dependencies"}}
+        fake_loader.platforms = {
+            "android": {
+                "approved_dependencies": {
+                    "reactive": [
+                        {
+                            "name": "RxJava2",
+                            "purpose": "Reactive programming",
+                            "version": "2.x",
+                        }
+                    ]
+                }
             }
         }
-        mock_loader.load_principles.return_value = principles
-        mock_loader.load_platforms.return_value = {"android": platform_config}
-        mock_loader.get_platform_title.return_value = "Android"
-        mock_loader.get_common_prompt_data.return_value = (
-            principles,
-            "Android",
-            platform_config,
-        )
 
         cli = PrinciplesCLI()
-        result = cli.generate_dependency_prompt("android", ["rxjava2"])
+        result = cli.generate_dependency_prompt("android", ["rxjava2", "lodash", "rx-java-2"])
 
         assert "# Dependency Evaluation for Android" in result
         assert "## Dependency Status Check" in result
-        assert "rxjava2" in result
+        assert "- rxjava2 - ✅ APPROVED" in result
+        assert "- rx-java-2 - ✅ APPROVED" in result
+        assert "  - Purpose: Reactive programming" in result
+        assert "- lodash - ❌ NOT APPROVED" in result
 
-    @patch("principles_cli.LeapLoader")
-    def test_generate_dependency_prompt_multiple(self, mock_loader_class: Any) -> None:
+    def test_generate_dependency_prompt_multiple(self, fake_loader: FakeLeapLoader) -> None:
         """Test generating dependency prompt for multiple libraries."""
-        # Setup mock loader instance
-        mock_loader = mock_loader_class.return_value
-        principles = {"dependencies": {"why": "Minimize dependencies"}}
-        platform_config = {"approved_dependencies": {"frameworks": ["UIKit"]}}
-        mock_loader.load_principles.return_value = principles
-        mock_loader.load_platforms.return_value = {"ios": platform_config}
-        mock_loader.get_platform_title.return_value = "iOS"
-        mock_loader.get_common_prompt_data.return_value = (
-            principles,
-            "iOS",
-            platform_config,
-        )
+        fake_loader.principles = {"dependencies": {"why": "Minimize dependencies"}}
+        fake_loader.platforms = {"ios": {"approved_dependencies": {"frameworks": ["UIKit"]}}}
 
         cli = PrinciplesCLI()
         result = cli.generate_dependency_prompt("ios", ["react-native", "lodash"])
@@ -505,5 +546,297 @@ class TestDependencyPrompt:
         assert "lodash" in result
 
 
-if __name__ == "__main__":
-    pytest.main([__file__])
+class TestRender:
+    """Test cases for the render dispatcher."""
+
+    def test_render_shares_loaded_data(self, fake_loader: FakeLeapLoader) -> None:
+        """Test that rendering several prompts loads principles and platforms once."""
+        fake_loader.principles = {"testing": {"why": "Quality matters"}}
+        fake_loader.platforms = {"web": {"tools": {"testing": ["Jest"]}}}
+
+        cli = PrinciplesCLI()
+        architecture = cli.render("architecture", platform="web", layer="data")
+        dependencies = cli.render("dependencies", platform="web", dependencies=["react"])
+
+        assert "# Architecture Assistant for Web Data Layer" in architecture
+        assert "# Dependency Evaluation for Web" in dependencies
+        assert fake_loader.calls == {"principles": 1, "platforms": 1}
+
+    def test_render_reuses_prompts(self, fake_loader: FakeLeapLoader) -> None:
+        """Test that repeated options return the cached prompt."""
+        with patch.object(
+            PrinciplesCLI, "generate_review_prompt", return_value="review"
+        ) as mock_generate:
+            cli = PrinciplesCLI()
+            cli.render("review", platform="web", focus_areas=["security"])
+            cli.render("review", platform="web", focus_areas=["security"])
+            cli.render("review", platform="web", focus_areas=["testing"])
+
+        assert mock_generate.call_count == 2
+
+    def test_render_reloads_edited_yaml(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that render drops cached data and prompts after a source file changes."""
+        core = tmp_path / "core"
+        core.mkdir()
+        (core / "principles.yaml").write_text("principles: {}\n")
+        platforms = core / "platforms.yaml"
+        platforms.write_text("platforms:\n  web:\n    approved_dependencies: {}\n")
+        monkeypatch.setattr(principles_cli, "LeapLoader", lambda: LeapLoader(tmp_path))
+
+        cli = PrinciplesCLI()
+        before = cli.render("dependencies", platform="web", dependencies=["react"])
+
+        platforms.write_text(
+            "platforms:\n  web:\n    approved_dependencies:\n      framework:\n"
+            "        - name: React\n"
+        )
+        stat = platforms.stat()
+        os.utime(platforms, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        after = cli.render("dependencies", platform="web", dependencies=["react"])
+
+        assert "- react - ❌ NOT APPROVED" in before
+        assert "- react - ✅ APPROVED" in after
+
+    def test_render_unknown_kind(self, cli: PrinciplesCLI) -> None:
+        """Test that an unknown prompt kind is rejected."""
+        with pytest.raises(ValueError, match="Unknown prompt kind"):
+            cli.render("deploy", platform="web")
+
+
+class TestDaemon:
+    """Test cases for forwarding prompts through the daemon socket."""
+
+    def test_forward_without_daemon(self, tmp_path: Path) -> None:
+        """Test that forwarding falls back when no daemon is listening."""
+        assert daemon.forward("review", {}, tmp_path / "missing.sock") is None
+
+    def test_forward_round_trip(self, tmp_path: Path) -> None:
+        """Test that a running server renders prompts for forwarded commands."""
+        socket_path = tmp_path / "leap.sock"
+
+        def render(kind: str, **options: Any) -> str:
+            if kind != "review":
+                raise ValueError(f"Unknown prompt kind: {kind}")
+            return f"{kind} {options['platform']}"
+
+        server = daemon.make_server(render, socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            assert daemon.is_running(socket_path)
+            assert daemon.forward("review", {"platform": "web"}, socket_path) == "review web"
+            with pytest.raises(RuntimeError, match="Unknown prompt kind"):
+                daemon.forward("deploy", {}, socket_path)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_forward_relays_loader_exit(self, tmp_path: Path) -> None:
+        """Test that a loader's sys.exit becomes an error reply instead of killing the server."""
+        socket_path = tmp_path / "leap.sock"
+
+        def render(kind: str, **options: Any) -> str:
+            LeapLoader(tmp_path).load_yaml(tmp_path / "missing.yaml")
+            return kind
+
+        server = daemon.make_server(render, socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with pytest.raises(RuntimeError, match="File not found"):
+                daemon.forward("review", {}, socket_path)
+            assert daemon.is_running(socket_path)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_forward_times_out(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a daemon that never answers falls back to in-process rendering."""
+        socket_path = tmp_path / "leap.sock"
+        monkeypatch.setattr(daemon, "_RESPONSE_TIMEOUT", 0.05)
+
+        # Listening but never accepting: connect succeeds, the reply never comes
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(socket_path))
+            listener.listen()
+            assert daemon.forward("review", {}, socket_path) is None
+
+
+class TestLoadYaml:
+    """Test cases for LeapLoader.load_yaml caching."""
+
+    def test_load_yaml_reloads_modified_file(self, tmp_path: Path) -> None:
+        """Test that callers get copies of the cached parse, refreshed when the file changes."""
+        yaml_file = tmp_path / "rules.yaml"
+        yaml_file.write_text("severity: required\n")
+        loader = LeapLoader(tmp_path)
+
+        assert loader.load_yaml(yaml_file) == {"severity": "required"}
+        hits = _parse_yaml_file.cache_info().hits
+        loader.load_yaml(yaml_file)["severity"] = "mutated"
+        assert loader.load_yaml(yaml_file) == {"severity": "required"}
+        assert _parse_yaml_file.cache_info().hits == hits + 2
+
+        yaml_file.write_text("severity: critical\n")
+        stat = yaml_file.stat()
+        os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert loader.load_yaml(yaml_file) == {"severity": "critical"}
+
+    @pytest.mark.parametrize(
+        "content, expected",
+        [
+            ("severity: required\n", {"severity": "required"}),
+            ("", {}),
+            ("invalid: yaml: [\n", SystemExit),
+        ],
+        ids=["valid", "empty", "invalid"],
+    )
+    def test_load_yaml_contents(
+        self, tmp_path: Path, content: str, expected: dict[str, Any] | type[SystemExit]
+    ) -> None:
+        """Test parsing valid, empty and malformed YAML files."""
+        yaml_file = tmp_path / "rules.yaml"
+        yaml_file.write_text(content)
+        loader = LeapLoader(tmp_path)
+
+        if isinstance(expected, dict):
+            assert loader.load_yaml(yaml_file) == expected
+        else:
+            with pytest.raises(expected):
+                loader.load_yaml(yaml_file)
+
+    def test_load_yaml_prefers_libyaml(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that parsing uses the C loader whenever PyYAML was built with libyaml."""
+        import yaml
+
+        if not hasattr(yaml, "CSafeLoader"):
+            pytest.skip("PyYAML built without libyaml")
+
+        loaders = []
+        real_load = yaml.load
+
+        def spy_load(stream: Any, **kwargs: Any) -> Any:
+            loaders.append(kwargs["Loader"])
+            return real_load(stream, **kwargs)
+
+        monkeypatch.setattr(yaml, "load", spy_load)
+        yaml_file = tmp_path / "rules.yaml"
+        yaml_file.write_text("severity: required\n")
+        LeapLoader(tmp_path).load_yaml(yaml_file)
+
+        assert loaders == [yaml.CSafeLoader]
+
+    def test_load_yaml_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing file exits with an error."""
+        with pytest.raises(SystemExit):
+            LeapLoader(tmp_path).load_yaml(tmp_path / "missing.yaml")
+
+
+class TestBuildParser:
+    """Test cases for the lazily populated argument parser."""
+
+    def test_selected_command_arguments(self) -> None:
+        """Test that the invoked command's arguments are parsed."""
+        argv = ["dependencies", "--platform", "web", "react", "axios"]
+        args = _build_parser(argv).parse_args(argv)
+
+        assert args.command == "dependencies"
+        assert args.platform == "web"
+        assert args.dependencies == ["react", "axios"]
+
+    def test_daemon_flag_before_command(self) -> None:
+        """Test that leading flags don't hide the command from the parser."""
+        argv = ["--daemon", "review", "--platform", "ios"]
+        args = _build_parser(argv).parse_args(argv)
+
+        assert args.daemon
+        assert args.focus == "security,accessibility,testing"
+
+    def test_help_lists_all_commands(self) -> None:
+        """Test that commands without registered arguments still appear in help."""
+        help_text = _build_parser([]).format_help()
+
+        for command in ("review", "generate", "architecture", "dependencies"):
+            assert command in help_text
+
+
+class TestMain:
+    """Test cases for the leap command-line entry point."""
+
+    @pytest.mark.parametrize(
+        "argv, command, options",
+        [
+            (
+                ["review", "--platform", "web", "--focus", "security,testing"],
+                "review",
+                {"focus_areas": ["security", "testing"]},
+            ),
+            (["generate", "--platform", "ios"], "generate", {"component_type": "ui"}),
+            (
+                ["architecture", "--platform", "android", "--layer", "ui"],
+                "architecture",
+                {"layer": "ui"},
+            ),
+            (
+                ["dependencies", "--platform", "web", "react"],
+                "dependencies",
+                {"dependencies": ["react"]},
+            ),
+        ],
+        ids=["review", "generate", "architecture", "dependencies"],
+    )
+    def test_main_renders_command(
+        self,
+        argv: list[str],
+        command: str,
+        options: dict[str, Any],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that each command renders in-process with its parsed options."""
+        monkeypatch.setattr(sys, "argv", ["leap", *argv])
+        # No daemon listens here, so main() falls back to rendering in-process
+        monkeypatch.setenv("LEAP_DAEMON_SOCKET", str(tmp_path / "leap.sock"))
+
+        with patch.object(PrinciplesCLI, "render", return_value="rendered prompt") as render:
+            principles_cli.main()
+
+        render.assert_called_once_with(command, platform=argv[2], **options)
+        assert capsys.readouterr().out == "rendered prompt\n"
+
+    def test_main_rejects_daemon_with_command(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that --daemon refuses to silently drop a command."""
+        monkeypatch.setattr(sys, "argv", ["leap", "--daemon", "review", "--platform", "web"])
+
+        with patch.object(daemon, "serve") as serve, pytest.raises(SystemExit) as exc_info:
+            principles_cli.main()
+
+        assert exc_info.value.code == 2
+        serve.assert_not_called()
+        assert "--daemon only starts the server" in capsys.readouterr().err
+
+    def test_main_reports_malformed_data(
+        self,
+        fake_loader: FakeLeapLoader,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that wrongly shaped YAML values exit with an error, not a traceback."""
+        fake_loader.platforms = {"web": "bad"}
+        monkeypatch.setattr(sys, "argv", ["leap", "dependencies", "--platform", "web", "react"])
+        monkeypatch.setenv("LEAP_DAEMON_SOCKET", str(tmp_path / "leap.sock"))
+
+        with pytest.raises(SystemExit) as exc_info:
+            principles_cli.main()
+
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err == "Error: 'str' object has no attribute 'get'\n"